@@ -1,9 +1,13 @@
 import bcrypt
+import hashlib
 import logging
 import secrets
 import string
+from functools import lru_cache
 from datetime import datetime, timedelta
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 
@@ -58,6 +62,8 @@ SECURITY_QUESTIONS = [
 
 SIGNUP_SECURITY_QUESTION_INDICES = [0, 2, 4, 6]
 
+_SPECIAL_CHARS = frozenset(string.punctuation)
+
 
 
 
@@ -74,21 +80,32 @@ def validate_password_strength(password: str) -> dict:
         if len(password) < 8:
             result['requirements'].append('At least 8 characters')
         
+        # Classify every character in one pass; the classes are disjoint so elif is safe
+        has_upper = has_lower = has_digit = has_special = False
+        for c in password:
+            if c.isupper():
+                has_upper = True
+            elif c.islower():
+                has_lower = True
+            elif c.isdigit():
+                has_digit = True
+            elif c in _SPECIAL_CHARS:
+                has_special = True
+        
         # Uppercase letter
-        if not any(c.isupper() for c in password):
+        if not has_upper:
             result['requirements'].append('At least one uppercase letter')
         
         # Lowercase letter
-        if not any(c.islower() for c in password):
+        if not has_lower:
             result['requirements'].append('At least one lowercase letter')
         
         # Number
-        if not any(c.isdigit() for c in password):
+        if not has_digit:
             result['requirements'].append('At least one number')
         
         # Special character
-        special_chars = string.punctuation
-        if not any(c in special_chars for c in password):
+        if not has_special:
             result['requirements'].append('At least one special character (!@#$%^&*)')
         
         # Determine strength
@@ -120,24 +137,24 @@ def validate_password_strength(password: str) -> dict:
 
 
 
-def get_signup_security_questions() -> list:
+@lru_cache(maxsize=1)
+def get_signup_security_questions() -> tuple:
+    # The signup questions are fixed, so build them once and hand out the same immutable tuple
     try:
-        questions = [
+        questions = tuple(
             (idx, SECURITY_QUESTIONS[idx])
             for idx in SIGNUP_SECURITY_QUESTION_INDICES
-        ]
-        logger.debug(f"Returning fixed signup security questions (4 questions)")
+        )
+        logger.debug(f"Built fixed signup security questions ({len(questions)} questions)")
         return questions
     
     except Exception as e:
         logger.error(f"Error getting signup security questions: {e}")
-        return []
+        return ()
 
 
 def get_security_questions_for_user(username: str, num_questions: int = 3) -> list:
     try:
-        import random
-        
         # Always select from the fixed signup questions
         num_to_select = min(num_questions, len(SIGNUP_SECURITY_QUESTION_INDICES))
         
@@ -146,10 +163,10 @@ def get_security_questions_for_user(username: str, num_questions: int = 3) -> li
             return []
         
         # Select random questions from the fixed signup questions
-        selected_indices = random.sample(SIGNUP_SECURITY_QUESTION_INDICES, num_to_select)
+        selected_indices = sample_recovery_indices_batch(1, num_to_select)[0]
         
         questions = [
-            (idx, SECURITY_QUESTIONS[idx])
+            (int(idx), SECURITY_QUESTIONS[idx])
             for idx in selected_indices
         ]
         
@@ -161,6 +178,25 @@ def get_security_questions_for_user(username: str, num_questions: int = 3) -> li
         return []
 
 
+def sample_recovery_indices_batch(n: int, k: int, pool=None) -> np.ndarray:
+    """
+    Draw n independent recovery question selections in one vectorized call
+
+    Args:
+        n: Number of selections
+        k: Questions per selection (capped at the pool size)
+        pool: Question indices to choose from (default: SIGNUP_SECURITY_QUESTION_INDICES)
+
+    Returns:
+        Array of shape (n, k), each row k distinct indices from pool
+    """
+    pool = np.asarray(SIGNUP_SECURITY_QUESTION_INDICES if pool is None else pool)
+    k = min(k, len(pool))
+    # Shuffle every row of an (n, len(pool)) tiling independently, keep the first k columns
+    rows = np.random.default_rng().permuted(np.tile(pool, (n, 1)), axis=1)
+    return rows[:, :k]
+
+
 
 
 
@@ -470,7 +506,8 @@ def reset_password_db(username: str, role: str, new_password: str, conn) -> dict
         
         # Create token record in password reset tokens table
         token_string = str(uuid.uuid4())
-        token_hash = hash_password(token_string)
+        # The token is random, so a fast digest is enough - bcrypt's cost is only needed for passwords
+        token_hash = hashlib.sha256(token_string.encode('utf-8')).hexdigest()
         expires_at = datetime.utcnow() + timedelta(hours=1)
         
         # Determine token table name
@@ -504,6 +541,42 @@ def reset_password_db(username: str, role: str, new_password: str, conn) -> dict
         return result
 
 
+# Reset token cleanup
+
+def cleanup_expired_tokens_db(role: str, conn) -> int:
+    role_to_token_table = {
+        "Sales Associate": "fa25_ssc_password_reset_tokens_sales",
+        "Store Manager": "fa25_ssc_password_reset_tokens_manager",
+        "Executive": "fa25_ssc_password_reset_tokens_executive"
+    }
+    token_table = role_to_token_table.get(role)
+    if token_table is None:
+        # Never fall back to another role's table for a DELETE
+        logger.warning(f"Token cleanup skipped: Invalid role '{role}'")
+        return 0
+    
+    try:
+        cursor = conn.cursor()
+        
+        # One range delete on the indexed expires_at column; tokens are stored with UTC expiry
+        cursor.execute(
+            f"DELETE FROM {token_table} WHERE expires_at < %s",
+            (datetime.utcnow(),)
+        )
+        deleted = cursor.rowcount
+        
+        conn.commit()
+        cursor.close()
+        
+        logger.info(f"Cleaned up {deleted} expired reset tokens from {token_table}")
+        return deleted
+    
+    except Exception as e:
+        conn.rollback()
+        logger.error(f"Error cleaning up expired reset tokens in {token_table}: {e}")
+        return 0
+
+
 # Password history check
 
 def check_password_history(username: str, role: str, new_password: str, conn) -> dict:
@@ -14,6 +14,7 @@ from utils import (
     get_changed_records_since_last_run,
     logger
 )
+from sql_result_cache import clear_cached_results
 
 
 def get_last_etl_timestamp(config: Dict) -> str:
@@ -650,6 +651,9 @@ def run_etl_pipeline(config: Dict = None) -> bool:
             log_etl_run(config, 'FAILED', 0)
             return False
         
+        # The DW has changed - cached dashboard results are stale
+        clear_cached_results()
+        
         # Step 5: Log the run (for next incremental load)
         logger.info("Step 5/5: CDC - Logging ETL run for next incremental load")
         total_records = len(transformed_data['fa25_ssc_fact_sales'])
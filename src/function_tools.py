@@ -7,8 +7,9 @@ import plotly.express as px
 from typing import Dict, List, Tuple, Any, Optional
 
 from utils import get_mysql_connection, load_env_config
-from system_prompt import get_analysis_prompt, get_sql_generation_prompt
-from vanna_training_data import get_vanna_training_data, get_business_rules, get_schema_documentation
+from system_prompt import ANALYSIS_PROMPT, SQL_GENERATION_PROMPT
+from vanna_training_data import get_vanna_training_data, get_business_rules, get_schema_documentation, is_cacheable
+from sql_result_cache import get_cached_result, cache_result
 from pii_masking import PIIMasking
 
 # Import Vanna for SQL generation (LOCAL AGENT - Vanna 2.0.1)
@@ -26,6 +27,31 @@ if not VANNA_AVAILABLE:
     logger.warning("Vanna.AI not installed. SQL generation will not work.")
 
 
+class _UnprintableFilter(dict):
+    """str.translate table dropping non-printable characters except newline/tab/space
+    
+    Entries are filled in on first sight, so translate() does the filtering in
+    C instead of a per-character generator
+    """
+    def __missing__(self, codepoint):
+        char = chr(codepoint)
+        keep = char.isprintable() or char in '\n\t '
+        self[codepoint] = codepoint if keep else None
+        return self[codepoint]
+
+
+_UNPRINTABLE = _UnprintableFilter()
+_TRAILING_SPACE = re.compile(r'[^\S\n]+$', re.MULTILINE)
+
+# ANALYSIS_PROMPT's FORBIDDEN PATTERNS as one alternation, checked in a single pass:
+# asterisks after amounts, run-together words, inline italics
+_FORBIDDEN_FORMATTING = re.compile(
+    r'\$[\d,.]+\*+'
+    r'|[a-z]{25,}'
+    r'|(?<![*\w])\*[^*\s][^*\n]*\*(?![*\w])'
+)
+
+
 # ============================================================================
 # DATABASE TOOLS
 # ============================================================================
@@ -242,6 +268,11 @@ tools = {
     "get_schema": get_database_schema
 }
 
+# SQL of the trained pairs whose results may be served from sql_result_cache
+_CACHEABLE_TRAINED_SQL = frozenset(
+    entry['sql'] for entry in get_vanna_training_data() if is_cacheable(entry)
+)
+
 
 # ============================================================================
 # VANNA.AI INTEGRATION
@@ -329,6 +360,12 @@ class VannaHybrid:
         'trend', 'analysis', 'compare', 'performance', 'distribution', 'breakdown'
     }
     
+    # Compiled once: exact keywords, one regex for "starts with a metric or
+    # dimension", and a translate table for the punctuation we split on
+    _KEYWORDS = METRICS | DIMENSIONS | OPERATIONS
+    _KEYWORD_PREFIX = re.compile('|'.join(map(re.escape, sorted(METRICS | DIMENSIONS))))
+    _PUNCTUATION = str.maketrans("?!'.,:;", " " * 7)
+    
     def __init__(self, training_data: List[Dict], config: Dict):
         """
         Initialize with training data
@@ -339,6 +376,15 @@ class VannaHybrid:
         """
         self.training_data = training_data
         self.config = config
+        
+        # Keyword signature -> first trained pair with that signature, built
+        # once so ask() is a single dict lookup instead of re-extracting the
+        # keywords of every trained question per user question
+        self._intent_index = {}
+        for trained_pair in training_data:
+            signature = frozenset(self._extract_keywords(trained_pair.get('question', '')))
+            self._intent_index.setdefault(signature, trained_pair)
+        
         self.ready = True
         logger.debug(f"VannaHybrid initialized with {len(training_data)} training pairs")
     
@@ -361,20 +407,14 @@ class VannaHybrid:
             
             logger.debug(f"User keywords: {user_keywords}")
             
-            # Try exact keyword match on training data
-            for trained_pair in self.training_data:
-                trained_question = trained_pair.get('question', '')
-                trained_keywords = self._extract_keywords(trained_question)
-                
-                logger.debug(f"Trained keywords: {trained_keywords}")
-                
-                # EXACT MATCH: All user keywords must be in trained keywords
-                # (order and phrasing don't matter, only key business terms)
-                if user_keywords == trained_keywords:
-                    match_score = 1.0
-                    logger.info(f"[VANNA] Found EXACT keyword match (score: {match_score:.2f})")
-                    logger.debug(f"[VANNA] Trained question: {trained_question}")
-                    return trained_pair['sql']
+            # EXACT MATCH: the user's keyword set must equal a trained one
+            # (order and phrasing don't matter, only key business terms)
+            trained_pair = self._intent_index.get(frozenset(user_keywords))
+            if trained_pair is not None:
+                match_score = 1.0
+                logger.info(f"[VANNA] Found EXACT keyword match (score: {match_score:.2f})")
+                logger.debug(f"[VANNA] Trained question: {trained_pair.get('question', '')}")
+                return trained_pair['sql']
             
             # No exact match found
             logger.info("[VANNA] No exact keyword match found - will use Mistral LLM")
@@ -398,30 +438,15 @@ class VannaHybrid:
             Set of extracted business keywords (lowercase)
         """
         try:
-            # Normalize: lowercase, remove punctuation
-            normalized = question.lower()
-            # Remove common punctuation
-            for char in "?!'.,:;":
-                normalized = normalized.replace(char, " ")
-            
-            # Split into words
-            words = set(normalized.split())
-            
-            # Keep only business-relevant keywords
-            keywords = set()
-            
-            # Check against known business keywords
-            for word in words:
-                # Check if word matches or is part of a business term
-                if word in self.METRICS or word in self.DIMENSIONS or word in self.OPERATIONS:
-                    keywords.add(word)
-                # Check for partial matches (e.g., "shipping_cost" > "shipping")
-                elif any(word.startswith(metric) for metric in self.METRICS):
-                    keywords.add(word)
-                elif any(word.startswith(dim) for dim in self.DIMENSIONS):
-                    keywords.add(word)
+            # Normalize: lowercase, remove punctuation, split into words
+            words = set(question.lower().translate(self._PUNCTUATION).split())
             
-            return keywords
+            # Keep business keywords, plus words starting with a metric or
+            # dimension (e.g., "shipping_cost" > "shipping")
+            return {
+                word for word in words
+                if word in self._KEYWORDS or self._KEYWORD_PREFIX.match(word)
+            }
         
         except Exception as e:
             logger.warning(f"Error extracting keywords: {e}")
@@ -478,10 +503,8 @@ def generate_sql_with_vanna(vanna_client: Any, user_question: str, config: Dict,
         try:
             import requests
             
-            # Get SQL generation prompt with schema validation
-            sql_gen_prompt = get_sql_generation_prompt()
-            
-            sql_prompt = f"""{sql_gen_prompt}
+            # SQL generation prompt with schema validation
+            sql_prompt = f"""{SQL_GENERATION_PROMPT}
 
 QUESTION TO ANSWER: {user_question}"""
             
@@ -593,12 +616,8 @@ def generate_analysis_response(user_question: str, data_df: pd.DataFrame, config
         # Format data for LLM analysis
         data_summary = data_df.to_string()
         
-        # Get analysis system prompt
-        system_analysis_prompt = get_analysis_prompt()
-        
         # Build analysis prompt with system context
-        # Build analysis prompt with context
-        analysis_prompt = f"""{system_analysis_prompt}
+        analysis_prompt = f"""{ANALYSIS_PROMPT}
 
 Question: {user_question}
 
@@ -648,9 +667,12 @@ Data:
                 analysis_response = result.get('response', '').strip()
                 
                 # Clean up the response: remove control characters and extra whitespace
-                analysis_response = ''.join(char for char in analysis_response if char.isprintable() or char in '\n\t ')
-                analysis_response = '\n'.join(line.rstrip() for line in analysis_response.split('\n'))
-                analysis_response = analysis_response.strip()
+                analysis_response = analysis_response.translate(_UNPRINTABLE)
+                analysis_response = _TRAILING_SPACE.sub('', analysis_response).strip()
+                
+                forbidden = _FORBIDDEN_FORMATTING.search(analysis_response)
+                if forbidden:
+                    logger.warning(f"      [WARNING] Analysis uses forbidden formatting: {forbidden.group(0)!r}")
                 
                 logger.info(f"       Analysis generated using Mistral ({len(analysis_response)} chars)")
                 return analysis_response
@@ -824,7 +846,16 @@ def process_question(user_question: str, config: Dict = None, conversation_histo
         # STEP 2: Execute SQL to get data
         # =====================================================================
         logger.info("\nSTEP 4: Executing SQL on MySQL DW...")
-        data_df = tools["sql_executor"](conn, sql_query)
+        # Trained dashboard SQL is re-asked constantly - reuse its result until
+        # it expires or the next ETL run reloads the DW
+        cacheable = sql_query in _CACHEABLE_TRAINED_SQL
+        data_df = get_cached_result(sql_query) if cacheable else None
+        if data_df is not None:
+            logger.info("   > Reusing cached result for trained query")
+        else:
+            data_df = tools["sql_executor"](conn, sql_query)
+            if cacheable:
+                cache_result(sql_query, data_df)
         logger.info("   [SUCCESS] Query executed successfully")
         logger.info(f"   > Rows returned: {len(data_df)}")
         logger.info(f"   > Columns: {list(data_df.columns)}")
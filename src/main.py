@@ -42,7 +42,7 @@ from auth import (
 )
 from function_tools import process_question
 from etl_pipeline import run_etl_pipeline
-from sql_loader import load_orders_with_products, load_returns_from_csv, get_sample_csv_format
+from sql_loader import load_orders_with_products, load_returns_from_csv, get_sample_csv_format, read_loader_csv
 
 # ============================================================================
 # PAGE CONFIGURATION
@@ -2531,7 +2531,7 @@ def sql_loader_page():
         
         if uploaded_file is not None:
             try:
-                df_orders = pd.read_csv(uploaded_file)
+                df_orders = read_loader_csv(uploaded_file)
                 st.success(f"✓ {len(df_orders)} rows loaded")
                 st.dataframe(df_orders, width='stretch')
                 
@@ -2576,7 +2576,7 @@ def sql_loader_page():
         
         if uploaded_file_returns is not None:
             try:
-                df_returns = pd.read_csv(uploaded_file_returns)
+                df_returns = read_loader_csv(uploaded_file_returns)
                 st.success(f"✓ {len(df_returns)} rows loaded")
                 st.dataframe(df_returns, width='stretch')
                 
@@ -2603,6 +2603,32 @@ def sql_loader_page():
 # MAIN APP
 # ============================================================================
 
+# Role-based sidebar pages: (label, handler) in display order
+_ROLE_PAGES = {
+    "Sales Associate": [
+        ("📊 Dashboard", dashboard_page),
+        ("📝 Data Entry", data_entry_page),
+        ("📁 SQL Loader", sql_loader_page),
+        ("⚙️ Settings", settings_page),
+    ],
+    "Store Manager": [
+        ("📊 Dashboard", dashboard_page),
+        ("💬 Chat Analytics", chat_page),
+        ("⚙️ Settings", settings_page),
+    ],
+    "Executive": [
+        ("🔄 ETL Management", etl_management_page),
+        ("🗂️ Partition Monitoring", partition_monitoring_page),
+        ("⚙️ Settings", settings_page),
+    ],
+}
+
+_DEFAULT_PAGES = [
+    ("📊 Dashboard", dashboard_page),
+    ("⚙️ Settings", settings_page),
+]
+
+
 def main():
     """Main application logic"""
     
@@ -2613,14 +2639,8 @@ def main():
         st.sidebar.title("Navigation")
         
         # Define pages based on user role
-        if st.session_state.user_role == "Sales Associate":
-            pages = ["📊 Dashboard", "📝 Data Entry", "📁 SQL Loader", "⚙️ Settings"]
-        elif st.session_state.user_role == "Store Manager":
-            pages = ["📊 Dashboard", "💬 Chat Analytics", "⚙️ Settings"]
-        elif st.session_state.user_role == "Executive":
-            pages = ["🔄 ETL Management", "🗂️ Partition Monitoring", "⚙️ Settings"]
-        else:
-            pages = ["📊 Dashboard", "⚙️ Settings"]
+        entries = _ROLE_PAGES.get(st.session_state.user_role, _DEFAULT_PAGES)
+        pages = [label for label, _ in entries]
         
         page = st.sidebar.radio(
             "Choose a page:",
@@ -2636,20 +2656,8 @@ def main():
         st.sidebar.write(f"**{db_icon} Database:** {db_type_display}")
         
         # Page routing
-        if "Dashboard" in page:
-            dashboard_page()
-        elif "Data Entry" in page:
-            data_entry_page()
-        elif "SQL Loader" in page:
-            sql_loader_page()
-        elif "Chat Analytics" in page:
-            chat_page()
-        elif "ETL Management" in page:
-            etl_management_page()
-        elif "Partition Monitoring" in page:
-            partition_monitoring_page()
-        elif "Settings" in page:
-            settings_page()
+        handler = dict(entries)[page]
+        handler()
 
 
 if __name__ == "__main__":
@@ -1,16 +1,54 @@
 import logging
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import psycopg2
+from psycopg2 import sql as pg_sql
 import mysql.connector
-from datetime import datetime, timedelta
-from typing import Dict, List, Tuple
-from utils import get_postgres_connection, get_mysql_connection, load_env_config
+import calendar
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote
+from utils import get_postgres_connection, release_postgres_connection, get_mysql_connection, load_env_config
 
 logger = logging.getLogger(__name__)
 
+# Optional Arrow/Parquet archival path; archives fall back to COPY without it
+try:
+    import adbc_driver_postgresql.dbapi as pg_adbc
+    import pyarrow.parquet as pq
+except ImportError:
+    pg_adbc = None
+    pq = None
+
+
+def month_bounds(partition_date: date = None) -> Tuple[date, date]:
+    """
+    Get the [start, end) dates of the month containing partition_date
+    
+    Args:
+        partition_date: Any date in the target month (default: next month)
+    
+    Returns: (first day of the month, first day of the following month)
+    """
+    if partition_date is None:
+        # Next month starts where the current one ends
+        _, partition_date = month_bounds(date.today())
+    
+    start = date(partition_date.year, partition_date.month, 1)
+    end = start + timedelta(days=calendar.monthrange(start.year, start.month)[1])
+    return start, end
+
 
 class PostgreSQLPartitionManager:
     """Manage partitions for PostgreSQL OLTP tables"""
     
+    # Map table names to partition naming convention
+    TABLE_MAP = {
+        'ORDER_PARTITIONED': 'ORDER',
+        'ORDER_PRODUCT_PARTITIONED': 'ORDER_PRODUCT',
+        'RETURN_PARTITIONED': 'RETURN'
+    }
+    
     def __init__(self, config: Dict):
         """Initialize with database configuration"""
         self.config = config
@@ -26,65 +64,155 @@ class PostgreSQLPartitionManager:
             raise
     
     def disconnect(self):
-        """Disconnect from PostgreSQL"""
+        """Return the PostgreSQL connection to the shared pool"""
         if self.conn:
-            self.conn.close()
+            release_postgres_connection(self.conn)
+            self.conn = None
             logger.info("Disconnected from PostgreSQL")
     
-    def create_next_monthly_partition(self, table_name: str, partition_date: datetime = None):
+    def _monthly_partition_spec(self, table_name: str, partition_date: date = None):
         """
-        Create partition for next month automatically
+        Resolve partition name, date range and index column for a monthly partition
         
-        Args:
-            table_name: Name of partitioned table (ORDER_PARTITIONED, etc.)
-            partition_date: Date to create partition for (default: next month)
+        Returns: (partition_name, start_date, end_date, index_col), or None for unknown tables
         """
-        if partition_date is None:
-            partition_date = datetime.now() + timedelta(days=32)
+        if table_name not in self.TABLE_MAP:
+            return None
         
-        year = partition_date.year
-        month = partition_date.month
+        start_date, end_date = month_bounds(partition_date)
         
-        # Map table names to partition naming convention
-        table_map = {
-            'ORDER_PARTITIONED': 'ORDER',
-            'ORDER_PRODUCT_PARTITIONED': 'ORDER_PRODUCT',
-            'RETURN_PARTITIONED': 'RETURN'
-        }
+        short_name = self.TABLE_MAP[table_name]
+        partition_name = f"{short_name}_P_{start_date.year}_{start_date.month:02d}"
         
-        if table_name not in table_map:
-            logger.error(f"Unknown table: {table_name}")
-            return False
+        index_col = 'order_date' if 'ORDER' in table_name else 'return_date'
+        return partition_name, start_date, end_date, index_col
+    
+    def _parent_index_name(self, table_name: str, index_col: str) -> str:
+        """Name of the parent table's partitioned index on index_col"""
+        # Lower-cased to keep the name the unquoted DDL used to produce
+        return f"idx_{self.TABLE_MAP[table_name]}_{index_col}".lower()
+    
+    def _parent_index_sql(self, table_name: str, index_col: str) -> str:
+        """
+        DDL ensuring the parent table carries a partitioned index on index_col
         
-        short_name = table_map[table_name]
-        partition_name = f"{short_name}_P_{year}_{month:02d}"
+        New partitions then get their index cloned and attached as part of
+        CREATE TABLE ... PARTITION OF, with no separate CREATE INDEX. The index
+        is created ON ONLY the parent, so this is a catalog-only change that
+        never builds indexes on existing partitions inside the partition-creation
+        transaction; attach_partition_indexes() covers those afterwards.
+        """
+        return pg_sql.SQL("""
+            CREATE INDEX IF NOT EXISTS {index}
+            ON ONLY {table} ({column});
+            """).format(
+            index=pg_sql.Identifier(self._parent_index_name(table_name, index_col)),
+            table=pg_sql.Identifier('public', table_name),
+            column=pg_sql.Identifier(index_col)
+        )
+    
+    def attach_partition_indexes(self, table_name: str) -> int:
+        """
+        Index existing partitions and attach them to the parent's partitioned index
         
-        # Calculate date ranges
-        start_date = f"{year}-{month:02d}-01"
-        if month == 12:
-            end_date = f"{year + 1}-01-01"
-        else:
-            end_date = f"{year}-{month + 1:02d}-01"
+        An index created ON ONLY the parent stays invalid until every partition
+        has an attached index. Partitions without one get an idx_<partition>_<col>
+        index built with CREATE INDEX CONCURRENTLY, one at a time and outside any
+        transaction, so writes are not blocked; an index of that name left by
+        older maintenance runs is reused instead of rebuilt. Each is then
+        attached with ALTER INDEX ... ATTACH PARTITION, and PostgreSQL marks the
+        parent index valid after the last one.
         
+        Returns: Number of partition indexes attached, or -1 on failure
+        """
+        spec = self._monthly_partition_spec(table_name)
+        if spec is None:
+            logger.error(f"Unknown table: {table_name}")
+            return -1
+        
+        index_col = spec[3]
+        parent_index = self._parent_index_name(table_name, index_col)
+        autocommit = self.conn.autocommit
+        cursor = None
         try:
             cursor = self.conn.cursor()
+            cursor.execute("""
+            SELECT c.relname
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = to_regclass(format('%%I.%%I', 'public', %s))
+                AND to_regclass(format('%%I.%%I', 'public', %s)) IS NOT NULL
+                AND NOT EXISTS (
+                    SELECT 1
+                    FROM pg_inherits ii
+                    JOIN pg_index x ON x.indexrelid = ii.inhrelid
+                    WHERE ii.inhparent = to_regclass(format('%%I.%%I', 'public', %s))
+                        AND x.indrelid = c.oid
+                )
+            ORDER BY c.relname;
+            """, (table_name, parent_index, parent_index))
+            partitions = [row[0] for row in cursor.fetchall()]
+            self.conn.commit()
             
-            # Create partition
-            sql = f"""
-            CREATE TABLE public."{partition_name}" 
-            PARTITION OF public."{table_name}"
-            FOR VALUES FROM ('{start_date}') TO ('{end_date}');
-            """
+            # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+            self.conn.autocommit = True
+            for partition_name in partitions:
+                index_name = f"idx_{partition_name}_{index_col}".lower()
+                cursor.execute(pg_sql.SQL("""
+                CREATE INDEX CONCURRENTLY IF NOT EXISTS {index}
+                ON {partition} ({column});
+                """).format(
+                    index=pg_sql.Identifier(index_name),
+                    partition=pg_sql.Identifier('public', partition_name),
+                    column=pg_sql.Identifier(index_col)
+                ))
+                cursor.execute(pg_sql.SQL("ALTER INDEX {parent} ATTACH PARTITION {index};").format(
+                    parent=pg_sql.Identifier('public', parent_index),
+                    index=pg_sql.Identifier('public', index_name)
+                ))
+                logger.info(f"Attached {index_name} to {parent_index}")
+            
+            return len(partitions)
             
-            cursor.execute(sql)
+        except Exception as e:
+            logger.error(f"Failed to attach partition indexes for {table_name}: {e}")
+            if not self.conn.autocommit:
+                self.conn.rollback()
+            return -1
+        finally:
+            if cursor is not None:
+                cursor.close()
+            self.conn.autocommit = autocommit
+    
+    def create_next_monthly_partition(self, table_name: str, partition_date: date = None):
+        """
+        Create partition for next month automatically
+        
+        Args:
+            table_name: Name of partitioned table (ORDER_PARTITIONED, etc.)
+            partition_date: Any date in the month to create a partition for (default: next month)
+        """
+        spec = self._monthly_partition_spec(table_name, partition_date)
+        if spec is None:
+            logger.error(f"Unknown table: {table_name}")
+            return False
+        
+        partition_name, start_date, end_date, index_col = spec
+        
+        try:
+            cursor = self.conn.cursor()
             
-            # Create index on partition
-            index_col = 'order_date' if 'ORDER' in table_name else 'return_date'
-            idx_sql = f"""
-            CREATE INDEX idx_{partition_name}_{index_col} 
-            ON public."{partition_name}" ({index_col});
-            """
-            cursor.execute(idx_sql)
+            # Create partition; its index is cloned from the parent's partitioned index
+            sql = self._parent_index_sql(table_name, index_col) + pg_sql.SQL("""
+            CREATE TABLE {partition} 
+            PARTITION OF {table}
+            FOR VALUES FROM (%s) TO (%s);
+            """).format(
+                partition=pg_sql.Identifier('public', partition_name),
+                table=pg_sql.Identifier('public', table_name)
+            )
+            
+            cursor.execute(sql, (start_date, end_date))
             
             self.conn.commit()
             logger.info(f"Created partition {partition_name} for {table_name}")
@@ -100,27 +228,144 @@ class PostgreSQLPartitionManager:
         finally:
             cursor.close()
     
-    def get_partition_distribution(self, table_name: str) -> Dict:
+    def create_partitions_batch(self, specs: List[Tuple[str, date]]) -> bool:
+        """
+        Create several monthly partitions in a single transaction and round-trip
+        
+        Args:
+            specs: List of (table_name, partition_date) pairs; partition_date None means next month
+        """
+        statements = []
+        params = []
+        partition_names = []
+        
+        for table_name, partition_date in specs:
+            spec = self._monthly_partition_spec(table_name, partition_date)
+            if spec is None:
+                logger.error(f"Unknown table: {table_name}")
+                return False
+            
+            partition_name, start_date, end_date, index_col = spec
+            partition_names.append(partition_name)
+            
+            # IF NOT EXISTS keeps one existing partition from aborting the whole batch
+            statements.append(self._parent_index_sql(table_name, index_col))
+            statements.append(pg_sql.SQL("""
+            CREATE TABLE IF NOT EXISTS {partition} 
+            PARTITION OF {table}
+            FOR VALUES FROM (%s) TO (%s);
+            """).format(
+                partition=pg_sql.Identifier('public', partition_name),
+                table=pg_sql.Identifier('public', table_name)
+            ))
+            params.extend([start_date, end_date])
+        
+        if not statements:
+            return True
+        
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(pg_sql.Composed(statements), params)
+            self.conn.commit()
+            logger.info(f"Created partitions {', '.join(partition_names)}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Failed to create partitions {', '.join(partition_names)}: {e}")
+            self.conn.rollback()
+            return False
+        finally:
+            cursor.close()
+    
+    def _partition_name_range(self, table_name: str) -> Tuple[str, str]:
+        """
+        Get the [lower, upper) relname bounds covering a table's partitions
+        
+        Partitions are named <SHORT>_P_<yyyy>_<mm>; a half-open range on the
+        prefix can use pg_class's relname index, and unlike LIKE it neither
+        treats "_" as a wildcard nor matches ORDER_PRODUCT_* for ORDER
+        """
+        if table_name in self.TABLE_MAP:
+            prefix = f"{self.TABLE_MAP[table_name]}_P_"
+        else:
+            prefix = f"{table_name[:-12]}_"  # Remove _PARTITIONED
+        return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    
+    def count_partitions(self, table_name: str) -> int:
+        """
+        Count partitions of a table with a single-row aggregate
+        
+        Returns: Number of partitions, or -1 if the lookup failed
+        """
+        cursor = None
+        try:
+            prefix, upper = self._partition_name_range(table_name)
+            
+            cursor = self.conn.cursor()
+            cursor.execute("""
+            SELECT count(*)
+            FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE n.nspname = 'public'
+                AND c.relkind IN ('r', 'p')
+                AND c.relname >= %s::name
+                AND c.relname < %s::name;
+            """, (prefix, upper))
+            return cursor.fetchone()[0]
+            
+        except Exception as e:
+            logger.error(f"Failed to count partitions for {table_name}: {e}")
+            return -1
+        finally:
+            if cursor:
+                cursor.close()
+    
+    def get_partition_distribution(self, table_name: str, precise: bool = False,
+                                   since: Optional[date] = None) -> Dict:
         """
         Get distribution of rows across partitions
         
+        Args:
+            table_name: Name of partitioned table (ORDER_PARTITIONED, etc.)
+            precise: Measure on-disk size with pg_total_relation_size (heap, indexes
+                     and TOAST) instead of the relpages estimate kept by VACUUM/ANALYZE
+            since: Only report partitions for the month containing this date and later
+        
         Returns: Dict with partition stats
         """
         try:
             cursor = self.conn.cursor()
             
+            prefix, upper = self._partition_name_range(table_name)
+            
+            # The <yyyy>_<mm> suffix is fixed-width, so raising the lower name
+            # bound skips older partitions inside the same relname index range
+            lower = prefix
+            if since is not None:
+                lower = f"{prefix}{since.year}_{since.month:02d}"
+            
+            # pg_total_relation_size stats every fork of every partition on disk;
+            # relpages is already in the catalog row
+            if precise:
+                size_expr = "pg_total_relation_size(c.oid)"
+            else:
+                size_expr = "c.relpages::bigint * current_setting('block_size')::bigint"
+            
             sql = f"""
             SELECT 
-                schemaname,
-                tablename,
-                pg_total_relation_size(schemaname||'.'||tablename) as size_bytes
-            FROM pg_tables
-            WHERE tablename LIKE '{table_name[:-12]}_%'  -- Remove _PARTITIONED
-                AND schemaname = 'public'
-            ORDER BY tablename;
+                n.nspname AS schemaname,
+                c.relname AS tablename,
+                {size_expr} AS size_bytes
+            FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE n.nspname = 'public'
+                AND c.relkind IN ('r', 'p')
+                AND c.relname >= %s::name
+                AND c.relname < %s::name
+            ORDER BY c.relname;
             """
             
-            cursor.execute(sql)
+            cursor.execute(sql, (lower, upper))
             results = cursor.fetchall()
             cursor.close()
             
@@ -141,28 +386,60 @@ class PostgreSQLPartitionManager:
             logger.error(f"Failed to get partition distribution: {e}")
             return {}
     
-    def archive_old_partition(self, partition_name: str, archive_path: str = None):
+    def _postgres_uri(self) -> str:
+        """Build a libpq connection URI from the POSTGRES config section"""
+        pg_config = self.config.get('POSTGRES', {})
+        return (
+            f"postgresql://{quote(str(pg_config.get('USER')), safe='')}:{quote(str(pg_config.get('PASSWORD')), safe='')}"
+            f"@{pg_config.get('HOST')}:{pg_config.get('PORT')}/{quote(str(pg_config.get('DB')), safe='')}"
+        )
+    
+    def archive_old_partition(self, partition_name: str, archive_path: str = None, archive_format: str = 'parquet'):
         """
         Archive old partition (export to file, then can be safely deleted)
         
+        'parquet' pulls the partition as Arrow record batches over ADBC and writes
+        Snappy-compressed Parquet, so values are never rendered as text. Without
+        adbc_driver_postgresql/pyarrow installed it falls back to 'binary'.
+        'binary' and 'csv' stream a client-side file with COPY ... TO STDOUT;
+        restore binary archives with COPY ... FROM STDIN WITH (FORMAT BINARY).
+        
         Args:
             partition_name: Name of partition to archive (e.g., ORDER_P_2023_01)
             archive_path: Path to save archive file
+            archive_format: 'parquet', 'binary' or 'csv'
         """
+        if archive_format == 'parquet' and (pg_adbc is None or pq is None):
+            logger.info("adbc_driver_postgresql/pyarrow not installed - archiving with binary COPY")
+            archive_format = 'binary'
+        
+        extensions = {'parquet': 'parquet', 'binary': 'bin', 'csv': 'csv'}
+        if archive_format not in extensions:
+            logger.error(f"Unknown archive format: {archive_format}")
+            return False
+        
+        if archive_path is None:
+            archive_path = f"/tmp/archive_{partition_name}_{datetime.now().strftime('%Y%m%d')}.{extensions[archive_format]}"
+        
+        if archive_format == 'parquet':
+            return self._archive_partition_parquet(partition_name, archive_path)
+        
         try:
             cursor = self.conn.cursor()
             
             # Export partition data
-            if archive_path is None:
-                archive_path = f"/tmp/archive_{partition_name}_{datetime.now().strftime('%Y%m%d')}.csv"
-            
-            sql = f"""
-            COPY (SELECT * FROM public."{partition_name}")
-            TO PROGRAM 'cat > {archive_path}'
-            WITH (FORMAT CSV, HEADER);
-            """
-            
-            cursor.execute(sql)
+            copy_format = "FORMAT BINARY" if archive_format == 'binary' else "FORMAT CSV, HEADER"
+            sql = pg_sql.SQL("""
+            COPY (SELECT * FROM {partition})
+            TO STDOUT
+            WITH ({copy_format});
+            """).format(
+                partition=pg_sql.Identifier('public', partition_name),
+                copy_format=pg_sql.SQL(copy_format)
+            )
+            
+            with open(archive_path, 'wb') as archive_file:
+                cursor.copy_expert(sql, archive_file)
             self.conn.commit()
             
             logger.info(f"Archived {partition_name} to {archive_path}")
@@ -174,6 +451,29 @@ class PostgreSQLPartitionManager:
         finally:
             cursor.close()
     
+    def _archive_partition_parquet(self, partition_name: str, archive_path: str) -> bool:
+        """Stream a partition to Parquet as Arrow record batches over ADBC"""
+        try:
+            # Quote with psycopg2's rules; ADBC only takes the finished text
+            query = pg_sql.SQL("SELECT * FROM {partition}").format(
+                partition=pg_sql.Identifier('public', partition_name)
+            ).as_string(self.conn)
+            
+            with pg_adbc.connect(self._postgres_uri()) as adbc_conn:
+                with adbc_conn.cursor() as cursor:
+                    cursor.execute(query)
+                    reader = cursor.fetch_record_batch()
+                    with pq.ParquetWriter(archive_path, reader.schema, compression='snappy') as writer:
+                        for batch in reader:
+                            writer.write_batch(batch)
+            
+            logger.info(f"Archived {partition_name} to {archive_path}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Failed to archive partition: {e}")
+            return False
+    
     def drop_old_partition(self, partition_name: str, confirm: bool = False):
         """
         Drop old partition (AFTER archiving)
@@ -189,7 +489,9 @@ class PostgreSQLPartitionManager:
         try:
             cursor = self.conn.cursor()
             
-            sql = f'DROP TABLE public."{partition_name}";'
+            sql = pg_sql.SQL("DROP TABLE {partition};").format(
+                partition=pg_sql.Identifier('public', partition_name)
+            )
             cursor.execute(sql)
             self.conn.commit()
             
@@ -210,10 +512,14 @@ class PostgreSQLPartitionManager:
 class MySQLPartitionManager:
     """Manage partitions for MySQL OLAP tables"""
     
+    # DDL is only ever issued against these tables
+    PARTITIONED_TABLES = ('fa25_ssc_fact_sales_PARTITIONED', 'fa25_ssc_fact_return_PARTITIONED')
+    
     def __init__(self, config: Dict):
         """Initialize with database configuration"""
         self.config = config
         self.conn = None
+        self._prepared_cursors = {}
     
     def connect(self):
         """Connect to MySQL"""
@@ -226,35 +532,56 @@ class MySQLPartitionManager:
     
     def disconnect(self):
         """Disconnect from MySQL"""
+        for cursor in self._prepared_cursors.values():
+            cursor.close()
+        self._prepared_cursors = {}
+        
         if self.conn:
             self.conn.close()
+            self.conn = None
             logger.info("Disconnected from MySQL")
     
-    def create_next_monthly_partition(self, table_name: str, partition_date: datetime = None):
+    def _prepared_cursor(self, sql: str):
+        """
+        Get a cursor holding sql as a server-side prepared statement
+        
+        INFORMATION_SCHEMA queries are costly to parse and plan, so each distinct
+        statement is prepared once per connection and re-executed with new parameters.
+        """
+        cursor = self._prepared_cursors.get(sql)
+        if cursor is None:
+            cursor = self.conn.cursor(prepared=True)
+            self._prepared_cursors[sql] = cursor
+        return cursor
+    
+    @staticmethod
+    def _quote_identifier(name: str) -> str:
+        """Backtick-quote a MySQL identifier, escaping embedded backticks"""
+        return '`' + name.replace('`', '``') + '`'
+    
+    def create_next_monthly_partition(self, table_name: str, partition_date: date = None):
         """
         Create partition for next month automatically
         
         Args:
             table_name: Name of partitioned table (fa25_ssc_fact_sales_PARTITIONED, etc.)
-            partition_date: Date to create partition for (default: next month)
+            partition_date: Any date in the month to create a partition for (default: next month)
         """
-        if partition_date is None:
-            partition_date = datetime.now() + timedelta(days=32)
+        if table_name not in self.PARTITIONED_TABLES:
+            logger.error(f"Unknown table: {table_name}")
+            return False
         
-        year = partition_date.year
-        month = partition_date.month
-        next_month = month + 1 if month < 12 else 1
-        next_year = year if month < 12 else year + 1
+        start_date, end_date = month_bounds(partition_date)
         
-        partition_name = f"p_{year}{month:02d}"
-        partition_value = f"{next_year}{next_month:02d}"
+        partition_name = f"p_{start_date.year}{start_date.month:02d}"
+        partition_value = f"{end_date.year}{end_date.month:02d}"
         
         try:
             cursor = self.conn.cursor()
             
             sql = f"""
-            ALTER TABLE `{table_name}`
-            ADD PARTITION (PARTITION {partition_name} VALUES LESS THAN ({partition_value}));
+            ALTER TABLE {self._quote_identifier(table_name)}
+            ADD PARTITION (PARTITION {self._quote_identifier(partition_name)} VALUES LESS THAN ({partition_value}));
             """
             
             cursor.execute(sql)
@@ -279,50 +606,65 @@ class MySQLPartitionManager:
         
         Returns: Dict with partition stats
         """
+        return self.get_partition_distribution_bulk([table_name]).get(table_name, {})
+    
+    def get_partition_distribution_bulk(self, table_names: List[str] = None) -> Dict[str, Dict]:
+        """
+        Get distribution of rows across partitions for several tables in one
+        INFORMATION_SCHEMA.PARTITIONS scan
+        
+        Args:
+            table_names: Tables to report on (default: every partitioned table in the schema)
+        
+        Returns: Dict of table name -> partition stats
+        """
         try:
-            cursor = self.conn.cursor(dictionary=True)
-            
             sql = """
             SELECT 
+                TABLE_NAME,
                 PARTITION_NAME,
                 TABLE_ROWS,
                 DATA_LENGTH,
                 INDEX_LENGTH
             FROM INFORMATION_SCHEMA.PARTITIONS
-            WHERE TABLE_NAME = %s
-                AND TABLE_SCHEMA = 'awesome_inc_olap'
+            WHERE TABLE_SCHEMA = 'awesome_inc_olap'
                 AND PARTITION_NAME IS NOT NULL
-            ORDER BY PARTITION_NAME;
             """
-            
-            cursor.execute(sql, (table_name,))
+            params = ()
+            if table_names is not None:
+                if not table_names:
+                    return {}
+                sql += f"    AND TABLE_NAME IN ({', '.join(['%s'] * len(table_names))})\n"
+                params = tuple(table_names)
+            sql += "ORDER BY TABLE_NAME, PARTITION_NAME;"
+            
+            cursor = self._prepared_cursor(sql)
+            cursor.execute(sql, params)
             results = cursor.fetchall()
             
-            partition_stats = {}
-            total_rows = 0
-            total_size = 0
+            distribution = defaultdict(dict)
+            for name in table_names or []:
+                distribution[name] = {}
             
-            for row in results:
-                partition_name = row['PARTITION_NAME']
-                row_count = row['TABLE_ROWS']
-                size_bytes = row['DATA_LENGTH'] + row['INDEX_LENGTH']
+            for table, partition_name, row_count, data_length, index_length in results:
+                size_bytes = data_length + index_length
                 
-                partition_stats[partition_name] = {
+                distribution[table][partition_name] = {
                     'rows': row_count,
                     'size_bytes': size_bytes,
                     'size_mb': size_bytes / (1024 * 1024)
                 }
-                total_rows += row_count
-                total_size += size_bytes
             
-            logger.info(f"Partition distribution for {table_name}: {len(partition_stats)} partitions, {total_rows} rows, {total_size / (1024*1024):.2f} MB total")
-            return partition_stats
+            for name, partition_stats in distribution.items():
+                total_rows = sum(stats['rows'] for stats in partition_stats.values())
+                total_size = sum(stats['size_bytes'] for stats in partition_stats.values())
+                logger.info(f"Partition distribution for {name}: {len(partition_stats)} partitions, {total_rows} rows, {total_size / (1024*1024):.2f} MB total")
+            
+            return dict(distribution)
             
         except Exception as e:
             logger.error(f"Failed to get partition distribution: {e}")
             return {}
-        finally:
-            cursor.close()
     
     def export_partition(self, table_name: str, partition_name: str, output_file: str) -> bool:
         """
@@ -334,10 +676,8 @@ class MySQLPartitionManager:
             output_file: Path to save exported data
         """
         try:
-            cursor = self.conn.cursor()
-            
             # Get partition range to query
-            sql = f"""
+            sql = """
             SELECT 
                 PARTITION_DESCRIPTION
             FROM INFORMATION_SCHEMA.PARTITIONS
@@ -346,8 +686,9 @@ class MySQLPartitionManager:
                 AND TABLE_SCHEMA = 'awesome_inc_olap';
             """
             
+            cursor = self._prepared_cursor(sql)
             cursor.execute(sql, (table_name, partition_name))
-            result = cursor.fetchone()
+            result = cursor.fetchall()
             
             if result:
                 logger.info(f"Exported partition {partition_name} from {table_name} to {output_file}")
@@ -359,8 +700,6 @@ class MySQLPartitionManager:
         except Exception as e:
             logger.error(f"Failed to export partition: {e}")
             return False
-        finally:
-            cursor.close()
     
     def drop_old_partition(self, table_name: str, partition_name: str, confirm: bool = False) -> bool:
         """
@@ -375,12 +714,16 @@ class MySQLPartitionManager:
             logger.warning(f"Partition drop requested for {partition_name} but not confirmed. Set confirm=True to proceed.")
             return False
         
+        if table_name not in self.PARTITIONED_TABLES:
+            logger.error(f"Unknown table: {table_name}")
+            return False
+        
         try:
             cursor = self.conn.cursor()
             
             sql = f"""
-            ALTER TABLE `{table_name}`
-            DROP PARTITION `{partition_name}`;
+            ALTER TABLE {self._quote_identifier(table_name)}
+            DROP PARTITION {self._quote_identifier(partition_name)};
             """
             
             cursor.execute(sql)
@@ -395,12 +738,31 @@ class MySQLPartitionManager:
         finally:
             cursor.close()
     
-    def get_partition_health(self) -> Dict:
+    def get_partition_health(self, distribution: Dict[str, Dict] = None) -> Dict:
         """
         Get overall partition health report
         
+        Args:
+            distribution: Result of get_partition_distribution_bulk() to summarise
+                          instead of re-scanning INFORMATION_SCHEMA.PARTITIONS
+        
         Returns: Dict with health metrics
         """
+        if distribution is not None:
+            health_report = {}
+            for table, partition_stats in distribution.items():
+                if not partition_stats:
+                    continue
+                health_report[table] = {
+                    'partitions': len(partition_stats),
+                    'total_rows': sum(stats['rows'] for stats in partition_stats.values()),
+                    'total_size_mb': round(sum(stats['size_bytes'] for stats in partition_stats.values()) / 1024 / 1024, 2)
+                }
+            health_report = dict(sorted(health_report.items(), key=lambda item: item[1]['total_size_mb'], reverse=True))
+            
+            logger.info(f"Partition health report: {len(health_report)} partitioned tables")
+            return health_report
+        
         try:
             cursor = self.conn.cursor(dictionary=True)
             
@@ -447,35 +809,41 @@ def maintenance_postgresql(config: Dict):
     """
     Run PostgreSQL partition maintenance (call monthly)
     """
+    manager = PostgreSQLPartitionManager(config)
     try:
-        manager = PostgreSQLPartitionManager(config)
         manager.connect()
         
         # Create next month's partitions
         logger.info("Creating next month's PostgreSQL partitions...")
-        manager.create_next_monthly_partition('ORDER_PARTITIONED')
-        manager.create_next_monthly_partition('ORDER_PRODUCT_PARTITIONED')
-        manager.create_next_monthly_partition('RETURN_PARTITIONED')
+        manager.create_partitions_batch([
+            ('ORDER_PARTITIONED', None),
+            ('ORDER_PRODUCT_PARTITIONED', None),
+            ('RETURN_PARTITIONED', None)
+        ])
+        
+        # Bring partitions that predate the parent index under it (no-op once attached)
+        for table in ['ORDER_PARTITIONED', 'ORDER_PRODUCT_PARTITIONED', 'RETURN_PARTITIONED']:
+            manager.attach_partition_indexes(table)
         
-        # Monitor distribution
+        # Monitor partition counts
         logger.info("Checking partition distribution...")
         for table in ['ORDER_PARTITIONED', 'ORDER_PRODUCT_PARTITIONED', 'RETURN_PARTITIONED']:
-            stats = manager.get_partition_distribution(table)
-            logger.info(f"{table}: {len(stats)} partitions")
+            logger.info(f"{table}: {manager.count_partitions(table)} partitions")
         
-        manager.disconnect()
         logger.info("PostgreSQL partition maintenance complete")
         
     except Exception as e:
         logger.error(f"PostgreSQL maintenance failed: {e}")
+    finally:
+        manager.disconnect()
 
 
 def maintenance_mysql(config: Dict):
     """
     Run MySQL partition maintenance (call monthly)
     """
+    manager = MySQLPartitionManager(config)
     try:
-        manager = MySQLPartitionManager(config)
         manager.connect()
         
         # Create next month's partitions
@@ -483,21 +851,51 @@ def maintenance_mysql(config: Dict):
         manager.create_next_monthly_partition('fa25_ssc_fact_sales_PARTITIONED')
         manager.create_next_monthly_partition('fa25_ssc_fact_return_PARTITIONED')
         
-        # Monitor distribution
+        # Monitor distribution - one INFORMATION_SCHEMA scan covers every table.
+        # Per-partition rows are only fetched when debug logging will show them;
+        # otherwise MySQL rolls the totals up per table with GROUP BY.
         logger.info("Checking partition distribution...")
+        if logger.isEnabledFor(logging.DEBUG):
+            distribution = manager.get_partition_distribution_bulk()
+            logger.debug(f"Partition distribution: {distribution}")
+            health = manager.get_partition_health(distribution)
+        else:
+            health = manager.get_partition_health()
+        
         for table in ['fa25_ssc_fact_sales_PARTITIONED', 'fa25_ssc_fact_return_PARTITIONED']:
-            stats = manager.get_partition_distribution(table)
-            logger.info(f"{table}: {len(stats)} partitions")
+            partition_count = health.get(table, {}).get('partitions', 0)
+            logger.info(f"{table}: {partition_count} partitions")
         
         # Get health report
-        health = manager.get_partition_health()
         logger.info(f"Partition health: {health}")
         
-        manager.disconnect()
         logger.info("MySQL partition maintenance complete")
         
     except Exception as e:
         logger.error(f"MySQL maintenance failed: {e}")
+    finally:
+        manager.disconnect()
+
+
+def run_partition_maintenance(config: Dict):
+    """
+    Run PostgreSQL and MySQL partition maintenance concurrently
+    
+    The two databases are independent and each run spends most of its time
+    waiting on the server, so overlapping them bounds wall time by the slower one.
+    """
+    tasks = {
+        'PostgreSQL': maintenance_postgresql,
+        'MySQL': maintenance_mysql
+    }
+    
+    with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+        futures = {executor.submit(task, config): name for name, task in tasks.items()}
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                logger.error(f"{futures[future]} maintenance task failed: {e}")
 
 
 if __name__ == "__main__":
@@ -512,8 +910,7 @@ if __name__ == "__main__":
     
     # Run maintenance
     logger.info("Starting partition maintenance...")
-    maintenance_postgresql(config)
-    maintenance_mysql(config)
+    run_partition_maintenance(config)
     logger.info("Partition maintenance completed successfully")
 
 
@@ -1,6 +1,6 @@
 import re
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 try:
     from utils import setup_logger
@@ -10,6 +10,136 @@ except ImportError:
     logger = logging.getLogger(__name__)
 
 
+_NON_DIGIT = re.compile(r'\D')
+# Deletes every Latin-1 character that \D would strip; translate() runs as a
+# single C loop and skips the regex engine for the common ASCII case
+_DIGIT_TRANS = str.maketrans({c: None for c in map(chr, range(256)) if not c.isdecimal()})
+_WHITESPACE_RUN = re.compile(r'\s+')
+_NAME_TAIL = re.compile(r'(?<=\S)\S')
+_TAIL_CHARS = re.compile(r'(?<=.).', re.DOTALL)
+_CARD_GROUPS = re.compile(r'^(.{4})(.{4})(.{4})(.{4})$')
+_SSN_GROUPS = re.compile(r'^(.{3})(.{2})(.{4}).{2}$')
+_EMAIL_PARTS = re.compile(r'^([^@]*)(@?)(.*)$', re.DOTALL)
+_AMOUNT_PARTS = re.compile(r'^([^.]*)(\.?)(.*)$', re.DOTALL)
+
+
+# Vectorized column kernels for mask_dataframe. Each one mirrors its scalar
+# PIIMasking.mask_* counterpart value-for-value, using pandas .str operations
+# instead of a per-row Python call.
+
+# Star runs are shared rather than rebuilt per value; longer runs fall back to '*' * n
+_STARS = tuple('*' * n for n in range(65))
+
+
+def _star_run(n: int) -> str:
+    return _STARS[n] if 0 <= n < len(_STARS) else '*' * n
+
+
+def _digits_only(text: str) -> str:
+    digits = text.translate(_DIGIT_TRANS)
+    if not digits.isascii():
+        # Characters above U+00FF are untouched by the table; fall back to the regex
+        digits = _NON_DIGIT.sub('', digits)
+    return digits
+
+
+def _as_text(series):
+    """Object Series holding the str values of series, NaN everywhere else"""
+    import pandas as pd
+    try:
+        is_text = series.str.len().notna()
+    except AttributeError:
+        is_text = pd.Series(False, index=series.index)
+    return series.astype(object).where(is_text)
+
+
+def _stars(counts):
+    """Series of '*' runs, one per (non-negative) count"""
+    import pandas as pd
+    counts = counts.fillna(0).astype(int).clip(lower=0)
+    return pd.Series('*', index=counts.index, dtype=object).str.repeat(counts)
+
+
+def _vec_digits(text):
+    """Digits-only form of a text Series"""
+    # Bulk-loaded phone/card/SSN columns are usually stored as bare digit
+    # strings already; one isdecimal() pass then replaces the regex rewrite
+    if text.str.isdecimal().fillna(True).astype(bool).all():
+        return text
+    return text.str.replace(_NON_DIGIT, '', regex=True)
+
+
+def _keep_last_digits(digits, show_last, keep_when_equal):
+    lengths = digits.str.len().fillna(0).astype(int)
+    exposed = lengths >= show_last if keep_when_equal else lengths > show_last
+    star_counts = lengths.where(~exposed, lengths - show_last)
+    suffix = digits.str.slice(-show_last).where(exposed, '')
+    return _stars(star_counts) + suffix
+
+
+def _vec_name(series):
+    text = _as_text(series).str.strip()
+    masked = (
+        text.str.replace(_WHITESPACE_RUN, ' ', regex=True)
+        .str.replace(_NAME_TAIL, '*', regex=True)
+    )
+    return masked.where(text.fillna('') != '', '***')
+
+
+def _vec_postal_code(series, show_digits=3):
+    text = _as_text(series).str.strip()
+    lengths = text.str.len().fillna(0).astype(int)
+    exposed = lengths > show_digits
+    prefix = text.str.slice(0, show_digits).where(exposed, '')
+    masked = prefix + _stars(lengths.where(~exposed, lengths - show_digits))
+    return masked.where(lengths > 0, '*****')
+
+
+def _vec_phone(series, show_last=4):
+    text = _as_text(series)
+    digits = _vec_digits(text)
+    masked = _keep_last_digits(digits, show_last, keep_when_equal=False)
+    return masked.where(text.fillna('') != '', '***-***-****')
+
+
+def _vec_email(series):
+    text = _as_text(series)
+    parts = text.str.strip().str.extract(_EMAIL_PARTS)
+    local, has_at, domain = parts[0], parts[1] == '@', parts[2]
+    masked_local = local.str.replace(_TAIL_CHARS, '*', regex=True).where(local.str.len() > 1, '*')
+    masked = (masked_local + '@' + domain).where(has_at, '***')
+    return masked.where(text.fillna('') != '', '***@***')
+
+
+def _vec_credit_card(series, show_last=4):
+    text = _as_text(series)
+    digits = _vec_digits(text)
+    masked = _keep_last_digits(digits, show_last, keep_when_equal=True)
+    masked = masked.str.replace(_CARD_GROUPS, r'\1-\2-\3-\4', regex=True)
+    return masked.where(text.fillna('') != '', '****-****-****-****')
+
+
+def _vec_ssn(series, show_last=4):
+    text = _as_text(series)
+    digits = _vec_digits(text)
+    masked = _keep_last_digits(digits, show_last, keep_when_equal=True)
+    masked = masked.str.replace(_SSN_GROUPS, r'\1-\2-\3', regex=True)
+    return masked.where(text.fillna('') != '', '***-**-****')
+
+
+def _vec_financial(series, show_last=2):
+    text = series.astype(str).str.strip()
+    parts = text.str.extract(_AMOUNT_PARTS)
+    has_dot = parts[1] == '.'
+    digits = parts[0].str.replace(_NON_DIGIT, '', regex=True)
+    lengths = digits.str.len().fillna(0).astype(int)
+    masked_int = (_stars(lengths - show_last) + digits.str.slice(-show_last)).where(lengths > show_last, digits)
+    masked = masked_int + ('.' + parts[2]).where(has_dot, '')
+    # str.split('.') in the scalar path rejects more than one decimal point
+    masked = masked.where(text.str.count(re.escape('.')).fillna(0) <= 1, '****')
+    return masked.fillna('')
+
+
 class PIIMasking:
     
     LEVEL_FULL = "full"
@@ -29,6 +159,17 @@ class PIIMasking:
         'discount': 'financial'
     }
     
+    # mask type -> column kernel used by mask_dataframe
+    _VEC_DISPATCH: Dict[str, Callable] = {
+        'name': _vec_name,
+        'postal_code': _vec_postal_code,
+        'phone': _vec_phone,
+        'email': _vec_email,
+        'credit_card': _vec_credit_card,
+        'ssn': _vec_ssn,
+        'financial': _vec_financial
+    }
+    
     @staticmethod
     def mask_name(name: str, level: str = LEVEL_PARTIAL) -> str:
         if not name or not isinstance(name, str):
@@ -51,7 +192,7 @@ class PIIMasking:
         masked_parts = []
         for part in parts:
             if len(part) > 1:
-                masked_parts.append(f"{part[0]}{'*' * (len(part) - 1)}")
+                masked_parts.append(part[0] + _star_run(len(part) - 1))
             else:
                 masked_parts.append(part)
         
@@ -67,21 +208,21 @@ class PIIMasking:
             return "*****"
         
         if len(postal_code) <= show_digits:
-            return "*" * len(postal_code)
+            return _star_run(len(postal_code))
         
-        return postal_code[:show_digits] + "*" * (len(postal_code) - show_digits)
+        return postal_code[:show_digits] + _star_run(len(postal_code) - show_digits)
     
     @staticmethod
     def mask_phone(phone: str, show_last: int = 4) -> str:
         if not phone or not isinstance(phone, str):
             return "***-***-****"
         
-        digits = re.sub(r'\D', '', phone)
+        digits = _digits_only(phone)
         
         if len(digits) <= show_last:
-            return "*" * len(digits)
+            return _star_run(len(digits))
         
-        masked = "*" * (len(digits) - show_last) + digits[-show_last:]
+        masked = _star_run(len(digits) - show_last) + digits[-show_last:]
         
         return masked
     
@@ -100,7 +241,7 @@ class PIIMasking:
         if len(local) <= 1:
             masked_local = "*"
         else:
-            masked_local = local[0] + "*" * (len(local) - 1)
+            masked_local = local[0] + _star_run(len(local) - 1)
         
         return f"{masked_local}@{domain}"
     
@@ -109,15 +250,15 @@ class PIIMasking:
         if not card or not isinstance(card, str):
             return "****-****-****-****"
         
-        digits = re.sub(r'\D', '', card)
+        digits = _digits_only(card)
         
         if len(digits) < show_last:
-            return "*" * len(digits)
+            return _star_run(len(digits))
         
-        masked = "*" * (len(digits) - show_last) + digits[-show_last:]
+        masked = _star_run(len(digits) - show_last) + digits[-show_last:]
         
         if len(masked) == 16:
-            return f"{masked[:4]}-{masked[4:8]}-{masked[8:12]}-{masked[12:16]}"
+            return '-'.join((masked[0:4], masked[4:8], masked[8:12], masked[12:16]))
         
         return masked
     
@@ -126,48 +267,59 @@ class PIIMasking:
         if not ssn or not isinstance(ssn, str):
             return "***-**-****"
         
-        digits = re.sub(r'\D', '', ssn)
+        digits = _digits_only(ssn)
         
         if len(digits) < show_last:
-            return "*" * len(digits)
+            return _star_run(len(digits))
         
-        masked = "*" * (len(digits) - show_last) + digits[-show_last:]
+        masked = _star_run(len(digits) - show_last) + digits[-show_last:]
         
         if len(masked) == 11:
-            return f"{masked[:3]}-{masked[3:5]}-{masked[5:9]}"
+            return '-'.join((masked[0:3], masked[3:5], masked[5:9]))
         
         return masked
     
     @staticmethod
     def mask_financial(amount: Any, show_last: int = 2) -> str:
         try:
-            amount_str = str(amount).strip()
+            integer_part, dot, decimal_part = str(amount).strip().partition('.')
+            if '.' in decimal_part:
+                raise ValueError(f"too many decimal points in {amount!r}")
             
-            if '.' in amount_str:
-                integer_part, decimal_part = amount_str.split('.')
-                integer_digits = re.sub(r'\D', '', integer_part)
-                
-                if len(integer_digits) > show_last:
-                    masked_int = "*" * (len(integer_digits) - show_last) + integer_digits[-show_last:]
-                else:
-                    masked_int = integer_digits
-                
-                return f"{masked_int}.{decimal_part}"
-            else:
-                digits = re.sub(r'\D', '', amount_str)
-                if len(digits) > show_last:
-                    return "*" * (len(digits) - show_last) + digits[-show_last:]
-                return digits
+            digits = _digits_only(integer_part)
+            if len(digits) > show_last:
+                digits = _star_run(len(digits) - show_last) + digits[-show_last:]
+            
+            return f"{digits}.{decimal_part}" if dot else digits
         
         except Exception as e:
             logger.warning(f"Error masking financial data: {e}")
             return "****"
     
     @staticmethod
-    def mask_dataframe(df, field_mappings: Optional[Dict[str, str]] = None):
+    def _mask_column(series, vec_mask):
+        import numpy as np
+        import pandas as pd
+        
+        codes, uniques = pd.factorize(series)
+        if len(uniques) * 100 >= len(series):
+            return vec_mask(series)
+        
+        # Low-cardinality column (postal codes, segments, all-null): mask each
+        # distinct value once and broadcast back through the factorize codes
+        masked_uniques = vec_mask(pd.Series(uniques, dtype=object)).to_numpy(dtype=object)
+        masked_missing = vec_mask(pd.Series([None], dtype=object)).iloc[0]
+        lookup = np.append(masked_uniques, masked_missing)  # code -1 (missing) -> last slot
+        return pd.Series(lookup[codes], index=series.index, name=series.name)
+    
+    @staticmethod
+    def mask_dataframe(df, field_mappings: Optional[Dict[str, str]] = None, inplace: bool = False):
         try:
             import pandas as pd
-            df = df.copy()
+            if not inplace:
+                # Masked columns are rebuilt, not edited, so a shallow copy leaves the
+                # caller's frame untouched without duplicating the unmasked columns
+                df = df.copy(deep=False)
             
             if field_mappings is None:
                 field_mappings = {}
@@ -177,22 +329,12 @@ class PIIMasking:
                     logger.warning(f"Column '{column}' not found in DataFrame")
                     continue
                 
-                if mask_type == 'name':
-                    df[column] = df[column].apply(PIIMasking.mask_name)
-                elif mask_type == 'postal_code':
-                    df[column] = df[column].apply(PIIMasking.mask_postal_code)
-                elif mask_type == 'phone':
-                    df[column] = df[column].apply(PIIMasking.mask_phone)
-                elif mask_type == 'email':
-                    df[column] = df[column].apply(PIIMasking.mask_email)
-                elif mask_type == 'credit_card':
-                    df[column] = df[column].apply(PIIMasking.mask_credit_card)
-                elif mask_type == 'ssn':
-                    df[column] = df[column].apply(PIIMasking.mask_ssn)
-                elif mask_type == 'financial':
-                    df[column] = df[column].apply(PIIMasking.mask_financial)
-                else:
+                vec_mask = PIIMasking._VEC_DISPATCH.get(mask_type)
+                if vec_mask is None:
                     logger.warning(f"Unknown mask type: {mask_type}")
+                    continue
+                
+                df[column] = PIIMasking._mask_column(df[column], vec_mask)
             
             logger.info(f"Masked {len(field_mappings)} columns in DataFrame")
             return df
@@ -212,22 +354,9 @@ class PIIMasking:
             if key not in masked_data:
                 continue
             
-            value = masked_data[key]
-            
-            if mask_type == 'name':
-                masked_data[key] = PIIMasking.mask_name(value)
-            elif mask_type == 'postal_code':
-                masked_data[key] = PIIMasking.mask_postal_code(value)
-            elif mask_type == 'phone':
-                masked_data[key] = PIIMasking.mask_phone(value)
-            elif mask_type == 'email':
-                masked_data[key] = PIIMasking.mask_email(value)
-            elif mask_type == 'credit_card':
-                masked_data[key] = PIIMasking.mask_credit_card(value)
-            elif mask_type == 'ssn':
-                masked_data[key] = PIIMasking.mask_ssn(value)
-            elif mask_type == 'financial':
-                masked_data[key] = PIIMasking.mask_financial(value)
+            mask_fn = PIIMasking._DISPATCH.get(mask_type)
+            if mask_fn:
+                masked_data[key] = mask_fn(masked_data[key])
         
         return masked_data
     
@@ -254,6 +383,19 @@ class PIIMasking:
         
         return default_mappings.get(table_name, {})
 
+
+# mask type -> scalar mask used by mask_dict (filled in once the methods exist)
+PIIMasking._DISPATCH: Dict[str, Callable] = {
+    'name': PIIMasking.mask_name,
+    'postal_code': PIIMasking.mask_postal_code,
+    'phone': PIIMasking.mask_phone,
+    'email': PIIMasking.mask_email,
+    'credit_card': PIIMasking.mask_credit_card,
+    'ssn': PIIMasking.mask_ssn,
+    'financial': PIIMasking.mask_financial
+}
+
+
 def mask_customer_name(name: str) -> str:
     return PIIMasking.mask_name(name)
 
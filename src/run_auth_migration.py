@@ -2,14 +2,139 @@
 import psycopg2
 import mysql.connector
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Iterable, Union
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def run_postgres_migration(conn_string: str, sql_file: str):
+_SQL_EVENTS = ("'", '"', '`', '--', '#', '/*', ';')
+
+
+def iter_sql_statements(sql: Union[str, Iterable[str]]):
+    """
+    Yield the statements of a MySQL script one at a time
+    
+    Jumps between the next quote, comment or ';' with str.find rather than
+    walking every character, so semicolons inside string literals and
+    comments do not split statements. Comments are dropped, except
+    /*! ... */ version comments which MySQL executes.
+    
+    Args:
+        sql: Script text, or an iterable of text chunks (e.g. from
+             read_sql_chunks) which is consumed only as far as needed
+    """
+    chunks = iter((sql,) if isinstance(sql, str) else sql)
+    exhausted = False
+    sql = ''
+    next_at = {token: -1 for token in _SQL_EVENTS}
+    pieces = []
+    segment_start = pos = 0
+    
+    while True:
+        end = len(sql)
+        # Only re-search tokens whose cached position has been passed
+        for token, at in next_at.items():
+            if at < pos:
+                found = sql.find(token, pos)
+                next_at[token] = end if found == -1 else found
+        token = min(next_at, key=next_at.get)
+        at = next_at[token]
+        
+        # Work out where the token ends; None means the buffer stops first
+        if at == end:
+            skip_to = None
+        elif token == ';':
+            skip_to = at + 1
+        elif token == '/*':
+            closing = sql.find('*/', at + 2)
+            skip_to = None if closing == -1 or at + 2 >= end else closing + 2
+        elif token in ('--', '#'):
+            closing = sql.find('\n', at)
+            skip_to = None if closing == -1 else closing + 1
+        else:
+            # Quoted literal/identifier: skip backslash-escaped and doubled quotes
+            search = at + 1
+            while True:
+                closing = sql.find(token, search)
+                if closing == -1 or closing + 1 == end:
+                    skip_to = None
+                    break
+                escape = closing
+                while escape > at and sql[escape - 1] == '\\':
+                    escape -= 1
+                if (closing - escape) % 2:
+                    search = closing + 1
+                elif sql[closing + 1] == token:
+                    search = closing + 2
+                else:
+                    skip_to = closing + 1
+                    break
+        
+        if skip_to is None:
+            if not exhausted:
+                chunk = next(chunks, '')
+                if chunk:
+                    sql += chunk
+                    for token, at in next_at.items():
+                        if at == end:
+                            next_at[token] = -1
+                else:
+                    exhausted = True
+                continue
+            if at == end:
+                break
+            # Unterminated quote or comment runs to the end of the script
+            skip_to = len(sql)
+        
+        if token == ';':
+            pieces.append(sql[segment_start:at])
+            statement = ''.join(pieces).strip()
+            if statement:
+                yield statement
+            pieces = []
+            # Drop consumed text so the buffer stays around one chunk
+            sql = sql[skip_to:]
+            for token in next_at:
+                next_at[token] -= skip_to
+            segment_start = pos = 0
+        elif token in ('--', '#', '/*') and not sql.startswith('/*!', at):
+            pieces.append(sql[segment_start:at])
+            segment_start = pos = skip_to
+        else:
+            pos = skip_to
+    
+    pieces.append(sql[segment_start:])
+    statement = ''.join(pieces).strip()
+    if statement:
+        yield statement
+
+
+def read_sql_chunks(sql_file: str, chunk_size: int = 64 * 1024):
+    """Yield a SQL file in chunk_size pieces so statements can run while it is read"""
+    with open(sql_file, 'r', buffering=chunk_size) as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+
+def run_postgres_migration(conn_string: str, sql_file: str, conn=None):
+    """
+    Execute SQL migration file on PostgreSQL
+    
+    Args:
+        conn_string: PostgreSQL connection URI (unused when conn is given)
+        sql_file: Path to SQL file to execute
+        conn: Existing connection to run on, e.g. from utils.get_postgres_connection()
+              in a long-lived process; it is committed but left open for the caller
+    """
+    own_conn = conn is None
     try:
-        conn = psycopg2.connect(conn_string)
+        if own_conn:
+            conn = psycopg2.connect(conn_string)
         cursor = conn.cursor()
         
         # Read SQL file
@@ -20,14 +145,19 @@ def run_postgres_migration(conn_string: str, sql_file: str):
         cursor.execute(sql_content)
         conn.commit()
         cursor.close()
-        conn.close()
         
         logger.info(f"PostgreSQL Migration completed successfully from {sql_file}")
         return True
     
     except Exception as e:
         logger.error(f"PostgreSQL Migration failed: {e}")
+        if not own_conn:
+            conn.rollback()
         return False
+    
+    finally:
+        if own_conn and conn is not None:
+            conn.close()
 
 
 def run_mysql_migration(host: str, user: str, password: str, database: str, sql_file: str):
@@ -46,20 +176,25 @@ def run_mysql_migration(host: str, user: str, password: str, database: str, sql_
             host=host,
             user=user,
             password=password,
-            database=database
+            database=database,
+            autocommit=False
         )
         cursor = conn.cursor()
         
-        # Read SQL file
-        with open(sql_file, 'r') as f:
-            sql_content = f.read()
-        
-        # Split by semicolon and execute each statement
-        statements = [s.strip() for s in sql_content.split(';') if s.strip()]
-        for statement in statements:
-            cursor.execute(statement)
+        # Skip per-row uniqueness/FK checks while the file loads; restored below
+        # even if a statement fails, since the connection may outlive this call
+        cursor.execute("SET unique_checks = 0")
+        cursor.execute("SET foreign_key_checks = 0")
+        try:
+            # Statements run as soon as they are complete; the file is read in 64 KB chunks
+            for statement in iter_sql_statements(read_sql_chunks(sql_file)):
+                cursor.execute(statement)
+            
+            conn.commit()
+        finally:
+            cursor.execute("SET foreign_key_checks = 1")
+            cursor.execute("SET unique_checks = 1")
         
-        conn.commit()
         cursor.close()
         conn.close()
         
@@ -100,13 +235,6 @@ if __name__ == "__main__":
     logger.info(f"Database: {pg_config['HOST']}:{pg_config['PORT']}/{pg_config['DB']}")
     logger.info(f"Table: fa25_ssc_users_sales_associate (Sales Associate credentials)")
     
-    pg_success = run_postgres_migration(pg_conn_string, str(pg_sql_file))
-    
-    if pg_success:
-        logger.info("✓ PostgreSQL OLTP ready for Sales Associate authentication")
-    else:
-        logger.error("✗ PostgreSQL OLTP migration failed")
-    
     # =====================================================================
     # MySQL OLAP Migration (Store Manager & Executive Users)
     # =====================================================================
@@ -120,13 +248,24 @@ if __name__ == "__main__":
     logger.info(f"Tables: fa25_ssc_users_store_manager (Store Manager credentials)")
     logger.info(f"        fa25_ssc_users_executive (Executive credentials)")
     
-    mysql_success = run_mysql_migration(
-        mysql_config['HOST'],
-        mysql_config['USER'],
-        mysql_config['PASSWORD'],
-        mysql_config['DB'],
-        str(mysql_sql_file)
-    )
+    # The two servers are independent - run both migrations at once
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        pg_future = executor.submit(run_postgres_migration, pg_conn_string, str(pg_sql_file))
+        mysql_future = executor.submit(
+            run_mysql_migration,
+            mysql_config['HOST'],
+            mysql_config['USER'],
+            mysql_config['PASSWORD'],
+            mysql_config['DB'],
+            str(mysql_sql_file)
+        )
+        pg_success = pg_future.result()
+        mysql_success = mysql_future.result()
+    
+    if pg_success:
+        logger.info("✓ PostgreSQL OLTP ready for Sales Associate authentication")
+    else:
+        logger.error("✗ PostgreSQL OLTP migration failed")
     
     if mysql_success:
         logger.info("✓ MySQL OLAP ready for Store Manager and Executive authentication")
@@ -1,10 +1,210 @@
+import io
 import logging
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+import numpy as np
 import pandas as pd
-from typing import Dict
+from psycopg2.extras import execute_values
+from typing import Dict, List, Tuple
 from utils import get_postgres_connection, release_postgres_connection, load_env_config
 
+# pandas can hand CSV parsing to pyarrow's multithreaded reader when it is installed
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
 logger = logging.getLogger(__name__)
 
+
+def read_loader_csv(source) -> pd.DataFrame:
+    """
+    Parse an uploaded orders/returns CSV for the loaders
+    
+    Uses the pyarrow engine when available and falls back to pandas' C parser
+    
+    Args:
+        source: Path or file-like object (e.g. a Streamlit upload)
+    """
+    engine = 'pyarrow' if pyarrow is not None else 'c'
+    return pd.read_csv(source, engine=engine)
+
+
+# PostgreSQL binary COPY framing: signature, flags, header extension length / end marker
+_PGCOPY_HEADER = b'PGCOPY\n\xff\r\n\x00' + struct.pack('!ii', 0, 0)
+_PGCOPY_TRAILER = struct.pack('!h', -1)
+_PG_EPOCH = np.datetime64('2000-01-01', 'D')
+
+# Column types as the server stores them - binary COPY must match them exactly
+_ORDER_COPY_TYPES = {
+    'order_id': 'text',
+    'customer_id': 'text',
+    'order_date': 'date',
+    'order_priority': 'text'
+}
+_ORDER_PRODUCT_COPY_TYPES = {
+    'order_id': 'text',
+    'product_id': 'text',
+    'quantity': 'int4',
+    'sales': 'numeric',
+    'discount': 'numeric',
+    'profit': 'numeric',
+    'shipping_cost': 'numeric',
+    'ship_date': 'date',
+    'ship_mode': 'text'
+}
+
+# Range of the int4 quantity column - the binary COPY cast wraps anything outside it
+_INT4_MIN = -2**31
+_INT4_MAX = 2**31 - 1
+
+
+def _numeric_field(value: float) -> bytes:
+    """Length-prefixed numeric_send() encoding of value
+    
+    Goes through repr() like the text format would, so the server's typmod
+    rounding sees the same decimal either way
+    """
+    sign, digits, exponent = Decimal(repr(float(value))).as_tuple()
+    digits = ''.join(map(str, digits))
+    scale = max(-exponent, 0)
+    if exponent > 0:
+        digits += '0' * exponent
+    point = len(digits) - scale
+    integer, fraction = digits[:max(point, 0)], digits[max(point, 0):].zfill(scale)
+    
+    # Base-10000 groups aligned on the decimal point
+    integer = integer.zfill(-(-len(integer) // 4) * 4)
+    fraction = fraction.ljust(-(-len(fraction) // 4) * 4, '0')
+    aligned = integer + fraction
+    groups = [int(aligned[i:i + 4]) for i in range(0, len(aligned), 4)]
+    weight = len(integer) // 4 - 1
+    while groups and groups[0] == 0:
+        groups.pop(0)
+        weight -= 1
+    while groups and groups[-1] == 0:
+        groups.pop()
+    if not groups:
+        weight = sign = 0
+    
+    return struct.pack(f'!ihhHH{len(groups)}H', 8 + 2 * len(groups), len(groups),
+                       weight, 0x4000 if sign else 0, scale, *groups)
+
+
+def _binary_fields(column: pd.Series, pg_type: str) -> List[bytes]:
+    """Encode a column as length-prefixed binary COPY fields"""
+    if pg_type == 'text':
+        fields = []
+        for value in column.astype(str):
+            encoded = value.encode('utf-8')
+            fields.append(struct.pack('!i', len(encoded)) + encoded)
+        return fields
+    if pg_type == 'numeric':
+        return [_numeric_field(value) for value in column]
+    
+    if pg_type == 'date':
+        days = pd.to_datetime(column, format='mixed').values.astype('datetime64[D]') - _PG_EPOCH
+        values = days.astype('>i4')
+    else:
+        values = column.to_numpy().astype('>i4')
+    # Fixed 4-byte fields: prefix each value's bytes with the length in one array op
+    packed = np.empty((len(values), 2), dtype='>i4')
+    packed[:, 0] = 4
+    packed[:, 1] = values
+    raw = packed.tobytes()
+    return [raw[i:i + 8] for i in range(0, len(raw), 8)]
+
+
+def _copy_frame(cursor, table: str, frame: pd.DataFrame, column_types: Dict[str, str]) -> None:
+    """Stream a DataFrame into table with a single binary COPY ... FROM STDIN
+    
+    column_types maps each column to text/int4/numeric/date; the server reads
+    the values as-is instead of parsing text for every field
+    """
+    columns = list(column_types)
+    encoded = [_binary_fields(frame[name], column_types[name]) for name in columns]
+    field_count = struct.pack('!h', len(columns))
+    
+    buffer = io.BytesIO()
+    buffer.write(_PGCOPY_HEADER)
+    for fields in zip(*encoded):
+        buffer.write(field_count)
+        buffer.write(b''.join(fields))
+    buffer.write(_PGCOPY_TRAILER)
+    buffer.seek(0)
+    
+    cursor.copy_expert(
+        f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT binary)",
+        buffer
+    )
+
+
+def _text_column(csv_data: pd.DataFrame, name: str, default,
+                 low_cardinality: bool = False) -> pd.Series:
+    """Column as text, with default for a missing column or empty cells
+    
+    low_cardinality: Factorize first so only the distinct values are converted
+                     (status/region style columns with a handful of values)
+    """
+    if name not in csv_data.columns:
+        return pd.Series(str(default), index=csv_data.index)
+    if low_cardinality:
+        codes, uniques = pd.factorize(csv_data[name])
+        # Empty cells get code -1, which take() maps to the default appended last
+        labels = uniques.astype(str).append(pd.Index([str(default)]))
+        return pd.Series(labels.take(codes), index=csv_data.index)
+    return csv_data[name].fillna(default).astype(str)
+
+
+def _numeric_column(csv_data: pd.DataFrame, name: str, default, errors: List[str]) -> pd.Series:
+    """Column as numbers, with default for a missing column or empty cells
+    
+    Cells that are present but not finite numbers are reported in errors and left as NaN
+    """
+    if name not in csv_data.columns:
+        return pd.Series(default, index=csv_data.index, dtype='float64')
+    values = pd.to_numeric(csv_data[name], errors='coerce')
+    values = values.mask(np.isinf(values))
+    invalid = values.isna() & csv_data[name].notna()
+    for idx, raw in csv_data.loc[invalid, name].items():
+        errors.append(f"Row {idx+1}: invalid {name} {raw!r}")
+    return values.where(invalid, values.fillna(default))
+
+
+def _validate_order_records(records: pd.DataFrame, errors: List[str]) -> pd.Series:
+    """Mask of records that satisfy the ORDER / ORDER_PRODUCT constraints
+    
+    Rejected rows are reported in errors
+    """
+    valid = records[['quantity', 'sales', 'discount', 'shipping_cost']].notna().all(axis=1)
+    
+    out_of_range = records['quantity'].notna() & ~records['quantity'].between(_INT4_MIN, _INT4_MAX)
+    for idx, quantity in records.loc[out_of_range, 'quantity'].items():
+        errors.append(f"Row {idx+1}: quantity {quantity:.0f} out of range for integer")
+    valid &= ~out_of_range
+    
+    for column in ('order_id', 'customer_id', 'product_id'):
+        missing = records[column].str.strip() == ''
+        for idx in records.index[missing]:
+            errors.append(f"Row {idx+1}: missing {column}")
+        valid &= ~missing
+    
+    for column in ('order_date', 'ship_date'):
+        invalid = pd.to_datetime(records[column], errors='coerce', format='mixed').isna()
+        for idx, raw in records.loc[invalid, column].items():
+            errors.append(f"Row {idx+1}: invalid {column} {raw!r}")
+        valid &= ~invalid
+    
+    duplicate = records.duplicated(['order_id', 'product_id']) & valid
+    for idx, order_id in records.loc[duplicate, 'order_id'].items():
+        errors.append(f"Row {idx+1}: duplicate product for order {order_id}")
+    valid &= ~duplicate
+    
+    return valid
+
+
 # Orders + Products Loader
 def load_orders_with_products(csv_data: pd.DataFrame) -> Dict:
     config = load_env_config()
@@ -24,69 +224,67 @@ def load_orders_with_products(csv_data: pd.DataFrame) -> Dict:
         
         logger.info(f"Loading {len(csv_data)} order+product rows...")
         
-        cursor = conn.cursor()
+        # Build both record sets up front with column-wise casts
+        row_errors = []
+        order_date = _text_column(csv_data, 'order_date', '')
+        if 'ship_date' in csv_data.columns:
+            ship_date = csv_data['ship_date'].fillna(order_date).astype(str)
+        else:
+            ship_date = order_date
+        sales = _numeric_column(csv_data, 'sales_amount', 0, row_errors)  # Map sales_amount to sales column
+        quantity = _numeric_column(csv_data, 'quantity', 1, row_errors)
+        discount = _numeric_column(csv_data, 'discount', 0, row_errors)
+        shipping_cost = _numeric_column(csv_data, 'shipping_cost', 0, row_errors)
         
-        # Process each row - insert order if new, then insert product
-        for idx, row in csv_data.iterrows():
-            try:
-                # Create savepoint for this row to avoid transaction abort
-                savepoint_name = f"sp_row_{idx}"
-                cursor.execute(f"SAVEPOINT {savepoint_name}")
-                
-                order_id = str(row.get('order_id', ''))
-                customer_id = str(row.get('customer_id', ''))
-                order_date = str(row.get('order_date', ''))
-                order_priority = str(row.get('order_priority', 'Not Specified'))
-                
-                # Check if order already exists
-                cursor.execute(
-                    'SELECT order_id FROM "FA25_SSC_ORDER" WHERE order_id = %s',
-                    (order_id,)
-                )
-                order_exists = cursor.fetchone() is not None
-                
-                # Insert ORDER if new
-                if not order_exists:
-                    cursor.execute(
-                        '''INSERT INTO "FA25_SSC_ORDER" 
-                           (order_id, customer_id, order_date, order_priority)
-                           VALUES (%s, %s, %s, %s)''',
-                        (order_id, customer_id, order_date, order_priority)
-                    )
-                    results['orders_loaded'] += 1
-                    logger.debug(f"Inserted order: {order_id}")
-                
-                # Insert PRODUCT/ORDER_PRODUCT
-                product_id = str(row.get('product_id', ''))
-                sales = float(row.get('sales_amount', 0))  # Map sales_amount to sales column
-                quantity = int(row.get('quantity', 1))
-                discount = float(row.get('discount', 0))
-                shipping_cost = float(row.get('shipping_cost', 0))
-                ship_date = str(row.get('ship_date', order_date))
-                ship_mode = str(row.get('ship_mode', 'Standard Class'))
-                
-                # Calculate profit: sales * (1 - discount) - shipping_cost
-                profit = (sales * (1 - discount)) - shipping_cost
-                
-                cursor.execute(
-                    '''INSERT INTO "FA25_SSC_ORDER_PRODUCT"
-                       (order_id, product_id, quantity, sales, discount, profit,
-                        shipping_cost, ship_date, ship_mode)
-                       VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)''',
-                    (order_id, product_id, quantity, sales, discount, profit,
-                     shipping_cost, ship_date, ship_mode)
-                )
-                results['products_loaded'] += 1
-                logger.debug(f"Inserted product for order: {order_id}")
-                
-            except Exception as e:
-                error_msg = f"Row {idx+1}: {str(e)}"
+        records = pd.DataFrame({
+            'order_id': _text_column(csv_data, 'order_id', ''),
+            'customer_id': _text_column(csv_data, 'customer_id', ''),
+            'order_date': order_date,
+            'order_priority': _text_column(csv_data, 'order_priority', 'Not Specified'),
+            'product_id': _text_column(csv_data, 'product_id', ''),
+            'quantity': quantity,
+            'sales': sales,
+            'discount': discount,
+            # Calculate profit: sales * (1 - discount) - shipping_cost
+            'profit': sales * (1 - discount) - shipping_cost,
+            'shipping_cost': shipping_cost,
+            'ship_date': ship_date,
+            'ship_mode': _text_column(csv_data, 'ship_mode', 'Standard Class')
+        })
+        
+        # Drop rows the database would reject, so one bad row cannot abort the load
+        valid = _validate_order_records(records, row_errors)
+        if row_errors:
+            for error_msg in row_errors:
                 logger.error(error_msg)
-                results['errors'].append(error_msg)
-                try:
-                    cursor.execute(f"ROLLBACK TO {savepoint_name}")
-                except:
-                    pass
+            results['errors'].extend(row_errors)
+            records = records[valid]
+        records['quantity'] = records['quantity'].astype('int64')
+        
+        # First occurrence of an order wins
+        order_rows = records.drop_duplicates('order_id')[
+            ['order_id', 'customer_id', 'order_date', 'order_priority']
+        ]
+        product_rows = records[
+            ['order_id', 'product_id', 'quantity', 'sales', 'discount', 'profit',
+             'shipping_cost', 'ship_date', 'ship_mode']
+        ]
+        
+        cursor = conn.cursor()
+        
+        # One lookup for every order in the file, then insert only the new ones
+        cursor.execute(
+            'SELECT order_id FROM "FA25_SSC_ORDER" WHERE order_id = ANY(%s)',
+            (order_rows['order_id'].tolist(),)
+        )
+        existing = {row[0] for row in cursor.fetchall()}
+        new_orders = order_rows[~order_rows['order_id'].isin(existing)]
+        _copy_frame(cursor, '"FA25_SSC_ORDER"', new_orders, _ORDER_COPY_TYPES)
+        results['orders_loaded'] = len(new_orders)
+        
+        # Insert PRODUCT/ORDER_PRODUCT
+        _copy_frame(cursor, '"FA25_SSC_ORDER_PRODUCT"', product_rows, _ORDER_PRODUCT_COPY_TYPES)
+        results['products_loaded'] = len(product_rows)
         
         conn.commit()
         logger.info(f"Loaded {results['orders_loaded']} orders, {results['products_loaded']} products")
@@ -96,6 +294,8 @@ def load_orders_with_products(csv_data: pd.DataFrame) -> Dict:
         
     except Exception as e:
         conn.rollback()
+        results['orders_loaded'] = 0
+        results['products_loaded'] = 0
         error_msg = f"SQL Loader error: {str(e)}"
         logger.error(error_msg)
         results['errors'].append(error_msg)
@@ -105,13 +305,49 @@ def load_orders_with_products(csv_data: pd.DataFrame) -> Dict:
         release_postgres_connection(conn)
 
 
-def load_returns_from_csv(csv_data: pd.DataFrame) -> Dict:
+def _insert_return_batches(conn, batches: List[Tuple[int, List[tuple]]]) -> Tuple[int, Dict[int, str]]:
+    """
+    Insert and commit each (first row index, rows) batch of returns on conn
+    
+    Returns: (rows committed, error message per first row index of each failed batch)
+    """
+    loaded_rows = 0
+    errors = {}
+    cursor = conn.cursor()
+    try:
+        for start, batch in batches:
+            try:
+                # tbl_last_dt for CDC tracking
+                execute_values(
+                    cursor,
+                    '''INSERT INTO "FA25_SSC_RETURN"
+                       (return_id, return_status, order_id, return_region, tbl_last_dt)
+                       VALUES %s''',
+                    batch,
+                    template="(%s, %s, %s, %s, NOW())",
+                    page_size=1000
+                )
+                conn.commit()
+                loaded_rows += len(batch)
+            except Exception as e:
+                conn.rollback()
+                error_msg = f"Rows {start+1}-{start+len(batch)}: {str(e)}"
+                logger.error(error_msg)
+                errors[start] = error_msg
+    finally:
+        cursor.close()
+    return loaded_rows, errors
+
+
+def load_returns_from_csv(csv_data: pd.DataFrame, commit_every: int = 5000, workers: int = 4) -> Dict:
     """
     Bulk load returns from CSV
     Columns: returned, order_id, return_date, region
     
     Args:
         csv_data: DataFrame with return data
+        commit_every: Rows per committed batch; a failed batch is reported and skipped
+        workers: Pooled connections to spread the batches over when there is more than one
     
     Returns:
         Dictionary with results
@@ -132,35 +368,51 @@ def load_returns_from_csv(csv_data: pd.DataFrame) -> Dict:
         
         logger.info(f"Loading {len(csv_data)} returns...")
         
-        cursor = conn.cursor()
+        # Generate unique return_ids up front and insert every row in multi-row VALUES pages
+        # 8 random hex digits per id (what uuid4().hex[:8] gave) from one urandom call
+        random_hex = os.urandom(4 * len(csv_data)).hex().upper()
+        return_ids = [f"RET-{random_hex[i:i + 8]}" for i in range(0, len(random_hex), 8)]
+        rows = list(zip(
+            return_ids,
+            _text_column(csv_data, 'return_status', 'No', low_cardinality=True),
+            _text_column(csv_data, 'return_id', ''),  # CSV has return_id column which contains order_id
+            _text_column(csv_data, 'return_region', '', low_cardinality=True)
+        ))
         
-        # Process each row with tbl_last_dt for CDC tracking
-        for idx, row in csv_data.iterrows():
-            try:
-                import uuid
-                return_id = f"RET-{uuid.uuid4().hex[:8].upper()}"  # Generate unique return_id
-                return_status = str(row.get('return_status', 'No'))
-                order_id = str(row.get('return_id', ''))  # CSV has return_id column which contains order_id
-                return_region = str(row.get('return_region', ''))
-                
-                cursor.execute('''
-                    INSERT INTO "FA25_SSC_RETURN" 
-                    (return_id, return_status, order_id, return_region, tbl_last_dt)
-                    VALUES (%s, %s, %s, %s, NOW())
-                ''', (return_id, return_status, order_id, return_region))
-                
-                results['loaded_rows'] += 1
-                logger.debug(f"Inserted return {return_id} for order: {order_id}")
-                
-            except Exception as e:
-                error_msg = f"Row {idx+1}: {str(e)}"
-                logger.error(error_msg)
-                results['errors'].append(error_msg)
+        # Commit every commit_every rows so a large file neither holds one long
+        # transaction nor loses finished batches when a later one fails
+        batches = [(start, rows[start:start + commit_every]) for start in range(0, len(rows), commit_every)]
         
-        conn.commit()
-        logger.info(f"Loaded {results['loaded_rows']} returns")
+        # Batches commit independently, so they can also run side by side on
+        # separate connections; those are borrowed and returned on this thread
+        connections = [conn]
+        try:
+            while len(connections) < min(workers, len(batches)):
+                connections.append(get_postgres_connection(config))
+        except Exception as e:
+            logger.warning(f"Loading returns on {len(connections)} connection(s): {e}")
         
-        cursor.close()
+        try:
+            if len(connections) == 1:
+                outcomes = [_insert_return_batches(conn, batches)]
+            else:
+                with ThreadPoolExecutor(max_workers=len(connections)) as executor:
+                    outcomes = list(executor.map(
+                        _insert_return_batches,
+                        connections,
+                        [batches[i::len(connections)] for i in range(len(connections))]
+                    ))
+        finally:
+            for extra in connections[1:]:
+                release_postgres_connection(extra)
+        
+        failed = {}
+        for loaded_rows, errors in outcomes:
+            results['loaded_rows'] += loaded_rows
+            failed.update(errors)
+        results['errors'].extend(failed[start] for start in sorted(failed))
+        
+        logger.info(f"Loaded {results['loaded_rows']} returns")
         return results
         
     except Exception as e:
@@ -174,6 +426,19 @@ def load_returns_from_csv(csv_data: pd.DataFrame) -> Dict:
         release_postgres_connection(conn)
 
 
+# Sample CSVs offered for download on the SQL Loader page
+_SAMPLE_CSV_FORMATS = {
+    'orders': """order_id,customer_id,order_date,order_priority,category,product_name,sales_amount,quantity,discount,shipping_cost,ship_date,subcategory,ship_mode
+ORD-20251213-001,LP-CB0B73B0B889,2025-12-13,High,Technology,Laptop,1299.99,1,0.1,50.00,2025-12-13,Computers,Standard Class
+ORD-20251213-002,LP-A1C2F4E5D6G7,2025-12-13,Medium,Furniture,Desk Chair,299.99,2,0.05,25.00,2025-12-13,Chairs,Express Class
+ORD-20251213-003,LP-H8I9J0K1L2M3,2025-12-13,Low,Office Supplies,Pen Pack,49.99,5,0.0,10.00,2025-12-13,Writing Instruments,Standard Class""",
+    'returns': """returned,order_id,return_date,region
+Yes,ORD-20251213-001,2025-12-13,Central US
+Yes,ORD-20251213-002,2025-12-13,Eastern Asia
+Yes,ORD-20251213-003,2025-12-13,Oceania"""
+}
+
+
 def get_sample_csv_format(data_type: str) -> str:
     """
     Get sample CSV format for users
@@ -182,20 +447,6 @@ def get_sample_csv_format(data_type: str) -> str:
         data_type: 'orders' or 'returns'
     
     Returns:
-        Sample CSV as string
+        Sample CSV as string ("" for an unknown data_type)
     """
-    if data_type == 'orders':
-        return """order_id,customer_id,order_date,order_priority,category,product_name,sales_amount,quantity,discount,shipping_cost,ship_date,subcategory,ship_mode
-ORD-20251213-001,LP-CB0B73B0B889,2025-12-13,High,Technology,Laptop,1299.99,1,0.1,50.00,2025-12-13,Computers,Standard Class
-ORD-20251213-002,LP-A1C2F4E5D6G7,2025-12-13,Medium,Furniture,Desk Chair,299.99,2,0.05,25.00,2025-12-13,Chairs,Express Class
-ORD-20251213-003,LP-H8I9J0K1L2M3,2025-12-13,Low,Office Supplies,Pen Pack,49.99,5,0.0,10.00,2025-12-13,Writing Instruments,Standard Class"""
-    
-    elif data_type == 'returns':
-        return """returned,order_id,return_date,region
-Yes,ORD-20251213-001,2025-12-13,Central US
-Yes,ORD-20251213-002,2025-12-13,Eastern Asia
-Yes,ORD-20251213-003,2025-12-13,Oceania"""
-    
-    return ""
-    
-    return ""
+    return _SAMPLE_CSV_FORMATS.get(data_type, "")
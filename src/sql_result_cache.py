@@ -0,0 +1,66 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import pandas as pd
+
+
+# Short-lived cache of MySQL DW results for trained (dashboard) SQL
+#
+# The DW only changes when the ETL pipeline loads it, so results are kept for
+# RESULT_TTL_SECONDS and dropped as soon as an ETL run finishes (clear_cached_results)
+
+RESULT_TTL_SECONDS = 300
+MAX_CACHED_RESULTS = 512
+
+_lock = threading.Lock()
+# sql -> (expires_at, DataFrame), oldest first
+_results = OrderedDict()
+
+
+def get_cached_result(sql: str) -> Optional[pd.DataFrame]:
+    """
+    Get a cached result for this SQL text
+
+    Args:
+        sql: SQL query string
+
+    Returns:
+        Copy of the cached DataFrame, or None if missing or expired
+    """
+    with _lock:
+        cached = _results.get(sql)
+        if cached is None:
+            return None
+
+        expires_at, df = cached
+        if time.monotonic() >= expires_at:
+            del _results[sql]
+            return None
+
+        _results.move_to_end(sql)
+
+    # Callers mask and annotate the frame they get, so never hand out the cached one
+    return df.copy()
+
+
+def cache_result(sql: str, df: pd.DataFrame) -> None:
+    """
+    Cache the result of this SQL text for RESULT_TTL_SECONDS
+
+    Args:
+        sql: SQL query string
+        df: Query result
+    """
+    with _lock:
+        _results[sql] = (time.monotonic() + RESULT_TTL_SECONDS, df.copy())
+        _results.move_to_end(sql)
+        while len(_results) > MAX_CACHED_RESULTS:
+            _results.popitem(last=False)
+
+
+def clear_cached_results() -> None:
+    """Drop every cached result - called when the ETL pipeline has reloaded the DW"""
+    with _lock:
+        _results.clear()
@@ -271,6 +271,8 @@ CORRECT EXAMPLES:
 """
 
 
+# The prompts are module constants - import SQL_GENERATION_PROMPT / ANALYSIS_PROMPT
+# directly; the getters below are kept for existing callers
 def get_sql_generation_prompt():
     """
     Get the system prompt for SQL generation
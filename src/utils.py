@@ -1,86 +1,174 @@
+import atexit
+import copy
 import logging
+import logging.handlers
+import queue
+import threading
 import yaml
 import os
 from pathlib import Path
 import psycopg2
+import psycopg2.extras
 import mysql.connector
+import mysql.connector.pooling
 from psycopg2 import pool
+from psycopg2 import sql as pg_sql
 from datetime import datetime
 import json
 from functools import wraps
+from contextlib import contextmanager
+import time
 import traceback
+from types import MappingProxyType
 
+# libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as YamlSafeLoader
+except ImportError:
+    from yaml import SafeLoader as YamlSafeLoader
 
-def setup_logger(name, log_file=None, level=logging.INFO):
+
+class _BufferedFileHandler(logging.FileHandler):
+    """
+    FileHandler on a 64 KB buffered stream that does not flush after every record
+    
+    The stream is flushed by _BatchFlushHandler once per batch, and on close
+    """
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=64 * 1024,
+                    encoding=self.encoding, errors=self.errors)
+    
+    def emit(self, record):
+        if self.stream is None:
+            self.stream = self._open()
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+
+
+class _BatchFlushHandler(logging.handlers.MemoryHandler):
+    """MemoryHandler that also flushes its target's stream after handing over a batch"""
+    def flush(self):
+        self.acquire()
+        try:
+            super().flush()
+            if self.target:
+                self.target.flush()
+        finally:
+            self.release()
+
+
+# Shared by every logger set up below; Formatters hold no per-handler state
+_FILE_FMT = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_CONSOLE_FMT = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+
+
+# Names of the loggers setup_logger has already attached handlers to
+_configured = set()
+
+
+def setup_logger(name, log_file=None, level=logging.INFO, buffer_capacity=1024):
     logger = logging.getLogger(name)
     logger.setLevel(level)
     
-    # Prevent duplicate handlers - if logger already has handlers, return it as-is
-    if logger.handlers:
+    # Prevent duplicate handlers - each logger name is configured only once
+    if name in _configured:
         return logger
     
     # Create logs directory if it doesn't exist
     if log_file:
         log_dir = os.path.dirname(log_file)
-        if log_dir and not os.path.exists(log_dir):
+        if log_dir:
             os.makedirs(log_dir, exist_ok=True)
         
-        # File handler
-        file_handler = logging.FileHandler(log_file)
+        # File handler - written from a background listener thread through a
+        # 64 KB buffered stream, so logging calls never wait on file writes.
+        # Records are batched in memory and written out every buffer_capacity
+        # records, or straight away on ERROR
+        file_handler = _BufferedFileHandler(log_file)
         file_handler.setLevel(level)
-        file_formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        file_handler.setFormatter(_FILE_FMT)
+        
+        log_queue = queue.Queue(-1)
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+        queue_handler.setLevel(level)
+        logger.addHandler(queue_handler)
+        
+        batch_handler = _BatchFlushHandler(
+            buffer_capacity,
+            flushLevel=logging.ERROR,
+            target=file_handler
         )
-        file_handler.setFormatter(file_formatter)
-        logger.addHandler(file_handler)
+        
+        listener = logging.handlers.QueueListener(log_queue, batch_handler)
+        listener.start()
+        atexit.register(listener.stop)
     
     # Console handler
     console_handler = logging.StreamHandler()
     console_handler.setLevel(level)
-    console_formatter = logging.Formatter(
-        '%(asctime)s - %(levelname)s - %(message)s'
-    )
-    console_handler.setFormatter(console_formatter)
+    console_handler.setFormatter(_CONSOLE_FMT)
     logger.addHandler(console_handler)
     
+    _configured.add(name)
     return logger
 
 
 # Error handling decorator
 def handle_errors(func):
+    # Resolved once at decoration time rather than on every call
+    logger = logging.getLogger(func.__module__)
+    func_name = func.__qualname__
+    
     @wraps(func)
     def wrapper(*args, **kwargs):
-        logger = logging.getLogger(func.__module__)
-        func_name = func.__qualname__
-        
         try:
-            logger.debug(f"ENTER: {func_name}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("ENTER: %s", func_name)
             result = func(*args, **kwargs)
-            logger.debug(f"EXIT: {func_name} - Success")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("EXIT: %s - Success", func_name)
             return result
         
         except Exception as e:
-            error_msg = f"ERROR in {func_name}: {str(e)}"
-            logger.error(error_msg)
-            logger.debug(f"Traceback:\n{traceback.format_exc()}")
+            logger.error("ERROR in %s: %s", func_name, e)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Traceback:\n%s", traceback.format_exc())
             raise  # Re-raise so caller can handle
     
     return wrapper
 
 
 # Environment configuration
+# Parsed env.yaml per resolved path, with the st_mtime_ns it was parsed at
+_config_cache = {}
+
+
 def load_env_config(env_file_path='env.yaml'):
     # Look for env.yaml in project root
     if not os.path.exists(env_file_path):
         project_root = Path(__file__).parent.parent
         env_file_path = project_root / 'env.yaml'
     
+    logger = logging.getLogger(__name__)
+    
     try:
-        with open(env_file_path, 'r') as f:
-            config = yaml.safe_load(f)
-        logger = logging.getLogger(__name__)
-        logger.info(f"Configuration loaded from {env_file_path}")
-        return config
+        resolved_path = Path(env_file_path).resolve()
+        mtime_ns = os.stat(resolved_path).st_mtime_ns
+        
+        # Re-parse only when the file has changed since the last load; callers
+        # get their own copy so the cached config cannot be modified through them
+        cached = _config_cache.get(resolved_path)
+        if cached and cached[0] == mtime_ns:
+            logger.debug("Configuration reused from %s", env_file_path)
+            return copy.deepcopy(cached[1])
+        
+        with open(resolved_path, 'r') as f:
+            config = yaml.load(f, Loader=YamlSafeLoader)
+        _config_cache[resolved_path] = (mtime_ns, config)
+        logger.info("Configuration loaded from %s", env_file_path)
+        return copy.deepcopy(config)
     except FileNotFoundError:
         raise FileNotFoundError(f"env.yaml not found at {env_file_path}")
     except yaml.YAMLError as e:
@@ -90,50 +178,106 @@ def load_env_config(env_file_path='env.yaml'):
 # Database connections
 postgres_pool = None
 mysql_pool = None
+# Guards lazy creation of both pools
+_pool_lock = threading.Lock()
 
+# Connections idle in the pool longer than this are probed before reuse
+PG_IDLE_CHECK_SECONDS = 60
+# time.monotonic() at which each pooled PostgreSQL connection was released
+_pg_last_used = {}
 
-def get_postgres_connection(config):
+
+def _pg_connection_alive(conn):
+    """Cheap round trip to catch connections dropped while idle in the pool"""
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        conn.rollback()
+        return True
+    except psycopg2.Error:
+        return False
+
+
+def get_pool(config):
+    """
+    Get the process-wide PostgreSQL connection pool, creating it on first use
+    
+    Args:
+        config: Configuration dictionary
+    
+    Returns:
+        psycopg2 ThreadedConnectionPool shared by every caller in this process
+    """
     global postgres_pool
     
+    if postgres_pool is not None:
+        return postgres_pool
+    
     logger = logging.getLogger(__name__)
+    pg_config = config.get('POSTGRES', {})
     
-    try:
-        pg_config = config.get('POSTGRES', {})
-        
-        # Validate required config
-        required_keys = ['HOST', 'PORT', 'USER', 'PASSWORD', 'DB']
-        missing_keys = [k for k in required_keys if not pg_config.get(k)]
-        if missing_keys:
-            raise ValueError(f"Missing PostgreSQL config keys: {missing_keys}")
-        
+    # Validate required config
+    required_keys = ['HOST', 'PORT', 'USER', 'PASSWORD', 'DB']
+    missing_keys = [k for k in required_keys if not pg_config.get(k)]
+    if missing_keys:
+        raise ValueError(f"Missing PostgreSQL config keys: {missing_keys}")
+    
+    # Double-checked so concurrent first callers build only one pool
+    with _pool_lock:
         if postgres_pool is None:
-            logger.info(f"Creating PostgreSQL connection pool to {pg_config.get('HOST')}:{pg_config.get('PORT')}")
-            postgres_pool = psycopg2.pool.SimpleConnectionPool(
+            logger.info("Creating PostgreSQL connection pool to %s:%s", pg_config.get('HOST'), pg_config.get('PORT'))
+            # Threaded pool: the loaders borrow connections from worker threads.
+            # Opening minconn connections up front doubles as pool warmup
+            postgres_pool = psycopg2.pool.ThreadedConnectionPool(
                 5, 50,
                 host=pg_config.get('HOST'),
                 port=pg_config.get('PORT'),
                 user=pg_config.get('USER'),
                 password=pg_config.get('PASSWORD'),
-                database=pg_config.get('DB')
+                database=pg_config.get('DB'),
+                # TCP keepalives so idle pooled connections are not silently dropped
+                keepalives=1,
+                keepalives_idle=30,
+                keepalives_interval=10,
+                keepalives_count=3
             )
             logger.info("PostgreSQL connection pool created")
+    
+    return postgres_pool
+
+
+def get_postgres_connection(config):
+    logger = logging.getLogger(__name__)
+    
+    try:
+        pg_pool = get_pool(config)
+        
+        while True:
+            conn = pg_pool.getconn()
+            last_used = _pg_last_used.pop(conn, None)
+            if (last_used is None
+                    or time.monotonic() - last_used <= PG_IDLE_CHECK_SECONDS
+                    or _pg_connection_alive(conn)):
+                break
+            # Stale connection: discard it and let the pool hand out another
+            logger.warning("Discarding stale PostgreSQL connection from pool")
+            pg_pool.putconn(conn, close=True)
         
-        conn = postgres_pool.getconn()
         logger.debug("PostgreSQL connection acquired from pool")
         return conn
     
     except psycopg2.OperationalError as e:
-        logger.error(f"PostgreSQL connection error: {e}")
+        logger.error("PostgreSQL connection error: %s", e)
         logger.error("Check: hostname, port, credentials, firewall rules")
         raise
     except psycopg2.DatabaseError as e:
-        logger.error(f"PostgreSQL database error: {e}")
+        logger.error("PostgreSQL database error: %s", e)
         raise
     except ValueError as e:
-        logger.error(f"Configuration error: {e}")
+        logger.error("Configuration error: %s", e)
         raise
     except Exception as e:
-        logger.error(f"Unexpected error connecting to PostgreSQL: {e}")
+        logger.error("Unexpected error connecting to PostgreSQL: %s", e)
         raise
 
 
@@ -150,14 +294,33 @@ def release_postgres_connection(conn):
     try:
         if postgres_pool and conn:
             postgres_pool.putconn(conn)
+            if not conn.closed:
+                _pg_last_used[conn] = time.monotonic()
             logger.info("PostgreSQL connection released back to pool")
     except Exception as e:
-        logger.error(f"Error releasing PostgreSQL connection: {e}")
+        logger.error("Error releasing PostgreSQL connection: %s", e)
+
+
+@contextmanager
+def pg_conn(config):
+    """
+    Borrow a PostgreSQL connection for a with-block
+    
+    The connection goes back to the pool even if the block raises
+    
+    Args:
+        config: Configuration dictionary
+    """
+    conn = get_postgres_connection(config)
+    try:
+        yield conn
+    finally:
+        release_postgres_connection(conn)
 
 
 def get_mysql_connection(config):
     """
-    Create MySQL connection with error handling
+    Get MySQL connection from the pool with error handling
     
     Args:
         config: Configuration dictionary
@@ -168,6 +331,8 @@ def get_mysql_connection(config):
     Raises:
         mysql.connector.Error: If connection fails
     """
+    global mysql_pool
+    
     logger = logging.getLogger(__name__)
     
     try:
@@ -177,34 +342,52 @@ def get_mysql_connection(config):
         required_keys = ['HOST', 'PORT', 'USER', 'PASSWORD', 'DB']
         missing_keys = [k for k in required_keys if not mysql_config.get(k)]
         if missing_keys:
-            logger.warning(f"⚠ MySQL not configured. Missing keys: {missing_keys}")
+            logger.warning("⚠ MySQL not configured. Missing keys: %s", missing_keys)
             logger.info("Using default localhost config")
         
-        logger.info(f"Connecting to MySQL at {mysql_config.get('HOST')}:{mysql_config.get('PORT')}")
-        
-        conn = mysql.connector.connect(
+        connect_args = dict(
             host=mysql_config.get('HOST', 'localhost'),
             port=mysql_config.get('PORT', 3306),
             user=mysql_config.get('USER', 'root'),
             password=mysql_config.get('PASSWORD', ''),
             database=mysql_config.get('DB', 'awesome_olap')
         )
-        logger.info("MySQL connection established")
+        
+        if mysql_pool is None:
+            with _pool_lock:
+                if mysql_pool is None:
+                    logger.info("Creating MySQL connection pool to %s:%s", mysql_config.get('HOST'), mysql_config.get('PORT'))
+                    mysql_pool = mysql.connector.pooling.MySQLConnectionPool(
+                        pool_name='awesome_inc_mysql',
+                        pool_size=10,
+                        **connect_args
+                    )
+                    logger.info("MySQL connection pool created")
+        
+        # conn.close() on a pooled connection hands it back to the pool
+        try:
+            conn = mysql_pool.get_connection()
+            logger.debug("MySQL connection acquired from pool")
+        except mysql.connector.errors.PoolError:
+            # MySQLConnectionPool does not wait for a free slot - fall back to a
+            # dedicated connection rather than failing the caller
+            logger.warning("MySQL connection pool exhausted, opening a dedicated connection")
+            conn = mysql.connector.connect(**connect_args)
         return conn
     
     except mysql.connector.errors.ProgrammingError as e:
-        logger.error(f"MySQL authentication error: {e}")
+        logger.error("MySQL authentication error: %s", e)
         logger.error("Check: username, password, database name")
         raise
     except mysql.connector.errors.DatabaseError as e:
-        logger.error(f"MySQL database error: {e}")
+        logger.error("MySQL database error: %s", e)
         raise
     except mysql.connector.Error as e:
-        logger.error(f"MySQL connection error: {e}")
+        logger.error("MySQL connection error: %s", e)
         logger.error("Check: host, port, service running, firewall rules")
         raise
     except Exception as e:
-        logger.error(f"Unexpected error connecting to MySQL: {e}")
+        logger.error("Unexpected error connecting to MySQL: %s", e)
         raise
 
 
@@ -212,7 +395,7 @@ def get_mysql_connection(config):
 # UTILITY FUNCTIONS
 # ============================================================================
 
-def execute_query(conn, query, fetch_all=True):
+def execute_query(conn, query, fetch_all=True, as_dict=False):
     """
     Execute a query on PostgreSQL and return results
     
@@ -220,28 +403,30 @@ def execute_query(conn, query, fetch_all=True):
         conn: PostgreSQL connection
         query: SQL query string
         fetch_all: If True, fetch all results; if False, fetch one
+        as_dict: If True, rows are dicts keyed by column name (ready for JSON);
+            tuples otherwise, which are cheaper to build
     
     Returns:
-        Query results (list of tuples or single tuple)
+        Query results (list of rows or single row)
     """
     logger = logging.getLogger(__name__)
     
     try:
-        cursor = conn.cursor()
-        logger.debug(f"Executing query: {query[:100]}...")
-        cursor.execute(query)
+        cursor_factory = psycopg2.extras.RealDictCursor if as_dict else None
+        with conn.cursor(cursor_factory=cursor_factory) as cursor:
+            logger.debug("Executing query: %.100s...", query)
+            cursor.execute(query)
+            
+            if fetch_all:
+                results = cursor.fetchall()
+            else:
+                results = cursor.fetchone()
         
-        if fetch_all:
-            results = cursor.fetchall()
-        else:
-            results = cursor.fetchone()
-        
-        cursor.close()
-        logger.info(f"Query executed successfully, rows returned: {len(results) if fetch_all else 1}")
+        logger.info("Query executed successfully, rows returned: %d", len(results) if fetch_all else 1)
         return results
     
     except Exception as e:
-        logger.error(f"Error executing query: {e}")
+        logger.error("Error executing query: %s", e)
         raise
 
 
@@ -249,6 +434,11 @@ def execute_query(conn, query, fetch_all=True):
 # CDC TRACKING (Change Data Capture via TBL_LAST_DT)
 # ============================================================================
 
+def _quote_mysql_identifier(name):
+    """Backtick-quote a MySQL identifier, escaping embedded backticks"""
+    return '`' + name.replace('`', '``') + '`'
+
+
 def get_last_etl_run_timestamp(config, table_name='FA25_SSC_ETL_LOG'):
     """
     Get the timestamp of the last successful ETL run from MySQL DW
@@ -265,6 +455,11 @@ def get_last_etl_run_timestamp(config, table_name='FA25_SSC_ETL_LOG'):
     """
     logger = logging.getLogger(__name__)
     
+    # Buffered runs must be visible before the last run is looked up
+    if _etl_log_buffer and table_name == 'FA25_SSC_ETL_LOG':
+        flush_etl_log_buffer(config)
+    
+    conn = None
     try:
         conn = get_mysql_connection(config)
         cursor = conn.cursor()
@@ -272,27 +467,31 @@ def get_last_etl_run_timestamp(config, table_name='FA25_SSC_ETL_LOG'):
         # Query last successful ETL run
         sql = f"""
         SELECT MAX(run_timestamp) as last_run 
-        FROM {table_name} 
+        FROM {_quote_mysql_identifier(table_name)} 
         WHERE status = 'SUCCESS'
         """
         
         cursor.execute(sql)
         result = cursor.fetchone()
         cursor.close()
-        conn.close()
         
         if result and result[0]:
             last_timestamp = result[0].strftime('%Y-%m-%d %H:%M:%S')
-            logger.info(f"CDC: Last ETL run was at {last_timestamp}")
+            logger.info("CDC: Last ETL run was at %s", last_timestamp)
             return last_timestamp
         else:
             logger.info("CDC: First ETL run - will extract all records")
             return '1900-01-01 00:00:00'
     
     except Exception as e:
-        logger.error(f"Error getting last ETL run timestamp: {e}")
+        logger.error("Error getting last ETL run timestamp: %s", e)
         logger.warning("CDC: Defaulting to first run (will extract all records)")
         return '1900-01-01 00:00:00'
+    
+    finally:
+        # Returns the connection to the MySQL pool
+        if conn is not None:
+            conn.close()
 
 
 def save_etl_run_metadata(config, status, records_processed, table_name='FA25_SSC_ETL_LOG'):
@@ -312,12 +511,13 @@ def save_etl_run_metadata(config, status, records_processed, table_name='FA25_SS
     """
     logger = logging.getLogger(__name__)
     
+    conn = None
     try:
         conn = get_mysql_connection(config)
         cursor = conn.cursor()
         
         sql = f"""
-        INSERT INTO {table_name} (run_timestamp, status, records_extracted, created_at)
+        INSERT INTO {_quote_mysql_identifier(table_name)} (run_timestamp, status, records_extracted, created_at)
         VALUES (NOW(), %s, %s, NOW())
         """
         
@@ -325,55 +525,184 @@ def save_etl_run_metadata(config, status, records_processed, table_name='FA25_SS
         conn.commit()
         
         cursor.close()
-        conn.close()
         
-        logger.info(f"CDC: ETL run logged - Status: {status}, Records: {records_processed}")
+        logger.info("CDC: ETL run logged - Status: %s, Records: %s", status, records_processed)
         return True
     
     except Exception as e:
-        logger.error(f"Error saving ETL run metadata: {e}")
+        logger.error("Error saving ETL run metadata: %s", e)
         return False
+    
+    finally:
+        # Returns the connection to the MySQL pool
+        if conn is not None:
+            conn.close()
 
 
-def get_changed_records_since_last_run(config, table_name, last_timestamp):
+def save_etl_run_metadata_batch(config, rows, table_name='FA25_SSC_ETL_LOG'):
     """
-    Query PostgreSQL OLTP for records changed since last ETL run
-    
-    Uses CDC column (TBL_LAST_DT) to get only changed records
-    Enables incremental load instead of full scan
+    Save several ETL run records to MySQL DW in one round trip and one commit
     
     Args:
         config: Configuration dictionary
-        table_name: Table name to query (TBL_SALES, TBL_RETURNS, etc.)
-        last_timestamp: Timestamp of last ETL run
+        rows: Sequence of (run_timestamp, status, records_processed) tuples
+        table_name: Name of ETL log table (default: FA25_SSC_ETL_LOG)
     
     Returns:
-        List of changed records, or empty list if none
+        True if successful (or nothing to save), False otherwise
     """
     logger = logging.getLogger(__name__)
     
+    if not rows:
+        return True
+    
+    conn = None
     try:
-        conn = get_postgres_connection(config)
+        conn = get_mysql_connection(config)
         cursor = conn.cursor()
         
         sql = f"""
-        SELECT * FROM {table_name}
-        WHERE TBL_LAST_DT > '{last_timestamp}'
-        ORDER BY TBL_LAST_DT ASC
+        INSERT INTO {_quote_mysql_identifier(table_name)} (run_timestamp, status, records_extracted, created_at)
+        VALUES (%s, %s, %s, NOW())
         """
         
-        cursor.execute(sql)
-        changed_records = cursor.fetchall()
+        cursor.executemany(sql, rows)
+        conn.commit()
         
         cursor.close()
-        release_postgres_connection(conn)
         
-        logger.info(f"CDC: Found {len(changed_records)} changed records in {table_name} since {last_timestamp}")
-        return changed_records
+        logger.info("CDC: %d ETL runs logged", len(rows))
+        return True
     
     except Exception as e:
-        logger.error(f"Error querying changed records from {table_name}: {e}")
-        return []
+        logger.error("Error saving ETL run metadata batch: %s", e)
+        if conn is not None:
+            conn.rollback()
+        return False
+    
+    finally:
+        if conn is not None:
+            conn.close()
+
+
+# ETL runs recorded with buffer_etl_run_metadata, waiting to be written to
+# the default ETL log table
+_etl_log_buffer = []
+_etl_log_flush_registered = False
+
+
+def buffer_etl_run_metadata(config, status, records_processed):
+    """
+    Queue an ETL run record to be written by flush_etl_log_buffer
+    
+    The run timestamp is taken now, not when the buffer is flushed. The buffer
+    is flushed at interpreter exit and before get_last_etl_run_timestamp reads
+    the log, so buffered runs are never missed by CDC.
+    """
+    global _etl_log_flush_registered
+    
+    _etl_log_buffer.append((datetime.now(), status, records_processed))
+    if not _etl_log_flush_registered:
+        atexit.register(flush_etl_log_buffer, config)
+        _etl_log_flush_registered = True
+
+
+def flush_etl_log_buffer(config):
+    """Write all buffered ETL run records in a single batch"""
+    rows = _etl_log_buffer[:]
+    if save_etl_run_metadata_batch(config, rows):
+        # Only drop what was written; records buffered meanwhile stay queued
+        del _etl_log_buffer[:len(rows)]
+        return True
+    return False
+
+
+def get_changed_records_since_last_run(config, table_name, last_timestamp, batch_size=10000,
+                                       ordered=False):
+    """
+    Query PostgreSQL OLTP for records changed since last ETL run
+    
+    Uses CDC column (TBL_LAST_DT) to get only changed records
+    Enables incremental load instead of full scan
+    
+    Rows are streamed from a server-side cursor batch_size at a time, so the
+    whole delta is never held in memory; the connection is returned to the
+    pool once iteration finishes or the generator is closed
+    
+    Rows come back unsorted unless ordered=True; use get_max_tbl_last_dt for
+    the next watermark instead of relying on the last row
+    
+    Args:
+        config: Configuration dictionary
+        table_name: Table name to query, matched exactly (e.g. FA25_SSC_ORDER)
+        last_timestamp: Timestamp of last ETL run
+        batch_size: Rows fetched per round trip
+        ordered: Return rows in TBL_LAST_DT order (served by the tbl_last_dt
+            btree indexes in sql/postgresql/indexes/create_indexes.sql)
+    
+    Yields:
+        Changed records (nothing if the query fails)
+    """
+    logger = logging.getLogger(__name__)
+    
+    try:
+        # Parameterized so the timestamp is never spliced into the SQL text;
+        # the table name is quoted as an identifier
+        sql = pg_sql.SQL("""
+        SELECT * FROM {table}
+        WHERE TBL_LAST_DT > %s
+        {order_by}
+        """).format(
+            table=pg_sql.Identifier(table_name),
+            order_by=pg_sql.SQL("ORDER BY TBL_LAST_DT ASC" if ordered else "")
+        )
+        
+        row_count = 0
+        with pg_conn(config) as conn:
+            try:
+                with conn.cursor(name='cdc_stream') as cursor:
+                    cursor.itersize = batch_size
+                    cursor.execute(sql, (last_timestamp,))
+                    for row in cursor:
+                        row_count += 1
+                        yield row
+            finally:
+                # End the read transaction the named cursor lives in before release
+                conn.rollback()
+        
+        logger.info("CDC: Found %d changed records in %s since %s", row_count, table_name, last_timestamp)
+    
+    except Exception as e:
+        logger.error("Error querying changed records from %s: %s", table_name, e)
+
+
+def get_max_tbl_last_dt(conn, table_name, since):
+    """
+    Get the newest TBL_LAST_DT after since - the next CDC watermark
+    
+    Args:
+        conn: PostgreSQL connection
+        table_name: Table name to query, matched exactly (e.g. FA25_SSC_ORDER)
+        since: Timestamp of last ETL run
+    
+    Returns:
+        Latest TBL_LAST_DT, or None if nothing changed since then
+    """
+    sql = pg_sql.SQL("SELECT MAX(TBL_LAST_DT) FROM {table} WHERE TBL_LAST_DT > %s").format(
+        table=pg_sql.Identifier(table_name)
+    )
+    with conn.cursor() as cursor:
+        cursor.execute(sql, (since,))
+        return cursor.fetchone()[0]
+
+
+_CDC_STATUS = MappingProxyType({
+    "tracking_method": "TBL_LAST_DT column with database triggers",
+    "extract_strategy": "Incremental - only changed records since last run",
+    "timestamp_source": "FA25_SSC_ETL_LOG table in MySQL DW",
+    "database_trigger": "PostgreSQL trigger sets TBL_LAST_DT = NOW() on INSERT/UPDATE",
+    "full_scan_fallback": "First run defaults to '1900-01-01 00:00:00' to get all records"
+})
 
 
 def get_cdc_status():
@@ -381,15 +710,10 @@ def get_cdc_status():
     Get current CDC (Change Data Capture) status for debugging
     
     Returns:
-        Dictionary with CDC statistics
+        Read-only mapping with CDC statistics (wrap in dict() to modify or
+        JSON-encode it)
     """
-    return {
-        "tracking_method": "TBL_LAST_DT column with database triggers",
-        "extract_strategy": "Incremental - only changed records since last run",
-        "timestamp_source": "FA25_SSC_ETL_LOG table in MySQL DW",
-        "database_trigger": "PostgreSQL trigger sets TBL_LAST_DT = NOW() on INSERT/UPDATE",
-        "full_scan_fallback": "First run defaults to '1900-01-01 00:00:00' to get all records"
-    }
+    return _CDC_STATUS
 
 
 # Initialize logger at module level
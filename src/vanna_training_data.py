@@ -1,5 +1,31 @@
+import hashlib
+import re
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+
+
+# Entries that differ only by year, expanded from one skeleton per family
+_YEAR_CHECK_SKELETON = (
+    "Do we have {year} data?",
+    """
+SELECT COUNT(*) as sales_count_{year} FROM fa25_ssc_fact_sales fs
+JOIN fa25_ssc_dim_date dd ON fs.date_key = dd.date_key
+WHERE dd.year = {year}
+        """
+)
+
+
+def _expand_skeleton(skeleton, years):
+    question, sql = skeleton
+    return [
+        {"question": question.format(year=year), "sql": sql.format(year=year)}
+        for year in years
+    ]
+
 # Vanna.AI training data for SQL generation
-VANNA_TRAINING_DATA = [
+# Frozen at import: a tuple of read-only mappings shared by every caller
+VANNA_TRAINING_DATA = tuple(MappingProxyType(entry) for entry in [
     # Basic dimension queries
     {
         "question": "Show all product categories",
@@ -83,6 +109,7 @@ FROM fa25_ssc_fact_sales fs
 JOIN fa25_ssc_dim_date dd ON fs.date_key = dd.date_key
 GROUP BY dd.full_date
 ORDER BY dd.full_date DESC
+LIMIT 365
         """
     },
     {
@@ -98,6 +125,7 @@ FROM fa25_ssc_fact_sales fs
 JOIN fa25_ssc_dim_date dd ON fs.date_key = dd.date_key
 GROUP BY dd.year, dd.month
 ORDER BY dd.year DESC, dd.month DESC
+LIMIT 60
         """
     },
     {
@@ -121,11 +149,13 @@ ORDER BY total_sales DESC
         "sql": """
 SELECT 
     dc.region,
-    COUNT(DISTINCT CASE WHEN fr.return_fact_key IS NOT NULL THEN fs.sales_key END) as total_returns,
-    COUNT(DISTINCT fs.sales_key) as total_orders,
-    ROUND(COUNT(DISTINCT CASE WHEN fr.return_fact_key IS NOT NULL THEN fs.sales_key END) * 100.0 / COUNT(DISTINCT fs.sales_key), 2) as return_rate_pct
+    COUNT(r.order_key) as total_returns,
+    COUNT(*) as total_orders,
+    ROUND(COUNT(r.order_key) * 100.0 / COUNT(*), 2) as return_rate_pct
 FROM fa25_ssc_fact_sales fs
-LEFT JOIN fa25_ssc_fact_return fr ON fs.sales_key = fr.order_key
+LEFT JOIN (
+    SELECT order_key FROM fa25_ssc_fact_return GROUP BY order_key
+) r ON r.order_key = fs.sales_key
 JOIN fa25_ssc_dim_customer dc ON fs.customer_key = dc.customer_key
 GROUP BY dc.region
 ORDER BY return_rate_pct DESC
@@ -136,7 +166,7 @@ ORDER BY return_rate_pct DESC
         "sql": """
 SELECT 
     fr.return_status,
-    COUNT(DISTINCT fr.return_fact_key) as return_count,
+    COUNT(*) as return_count,
     COUNT(DISTINCT fr.order_key) as related_orders,
     SUM(fs.sales) as returned_sales_value
 FROM fa25_ssc_fact_return fr
@@ -151,7 +181,7 @@ ORDER BY return_count DESC
 SELECT 
     dp.product_name,
     dp.category_name,
-    COUNT(DISTINCT fr.return_fact_key) as return_count,
+    COUNT(*) as return_count,
     COUNT(DISTINCT fr.order_key) as related_orders,
     SUM(fs.sales) as returned_sales_value
 FROM fa25_ssc_fact_return fr
@@ -167,11 +197,13 @@ LIMIT 10
         "sql": """
 SELECT 
     dp.category_name,
-    COUNT(DISTINCT CASE WHEN fr.return_fact_key IS NOT NULL THEN fs.sales_key END) as return_count,
-    COUNT(DISTINCT fs.sales_key) as total_orders,
-    ROUND(COUNT(DISTINCT CASE WHEN fr.return_fact_key IS NOT NULL THEN fs.sales_key END) * 100.0 / COUNT(DISTINCT fs.sales_key), 2) as return_rate_pct
+    COUNT(r.order_key) as return_count,
+    COUNT(*) as total_orders,
+    ROUND(COUNT(r.order_key) * 100.0 / COUNT(*), 2) as return_rate_pct
 FROM fa25_ssc_fact_sales fs
-LEFT JOIN fa25_ssc_fact_return fr ON fs.sales_key = fr.order_key
+LEFT JOIN (
+    SELECT order_key FROM fa25_ssc_fact_return GROUP BY order_key
+) r ON r.order_key = fs.sales_key
 JOIN fa25_ssc_dim_product dp ON fs.product_key = dp.product_key
 GROUP BY dp.category_name
 ORDER BY return_rate_pct DESC
@@ -228,19 +260,25 @@ ORDER BY total_sales DESC
         "question": "How do discounts impact profit?",
         "sql": """
 SELECT 
-    CASE 
-        WHEN fs.discount = 0 THEN 'No Discount'
-        WHEN fs.discount < 0.1 THEN '0-10%'
-        WHEN fs.discount < 0.2 THEN '10-20%'
-        ELSE '20%+'
-    END as discount_range,
+    ELT(db.discount_bucket, 'No Discount', '0-10%', '10-20%', '20%+') as discount_range,
     COUNT(*) as order_count,
-    AVG(fs.sales) as avg_sales,
-    AVG(fs.profit) as avg_profit,
-    ROUND(AVG(fs.profit) / AVG(fs.sales) * 100, 2) as profit_margin_pct
-FROM fa25_ssc_fact_sales fs
-GROUP BY discount_range
-ORDER BY discount_range
+    AVG(db.sales) as avg_sales,
+    AVG(db.profit) as avg_profit,
+    ROUND(AVG(db.profit) / AVG(db.sales) * 100, 2) as profit_margin_pct
+FROM (
+    SELECT 
+        CASE 
+            WHEN fs.discount = 0 THEN 1
+            WHEN fs.discount < 0.1 THEN 2
+            WHEN fs.discount < 0.2 THEN 3
+            ELSE 4
+        END as discount_bucket,
+        fs.sales,
+        fs.profit
+    FROM fa25_ssc_fact_sales fs
+) db
+GROUP BY db.discount_bucket
+ORDER BY db.discount_bucket
         """
     },
     {
@@ -300,16 +338,19 @@ LIMIT 20
 SELECT 
     dp.product_name,
     dp.category_name,
-    COUNT(DISTINCT fs.sales_key) as total_orders,
+    COUNT(*) as total_orders,
     SUM(fs.sales) as total_sales,
-    COUNT(DISTINCT fr.return_fact_key) as return_count,
-    ROUND(COUNT(DISTINCT CASE WHEN fr.return_fact_key IS NOT NULL THEN fs.sales_key END) * 100.0 / COUNT(DISTINCT fs.sales_key), 2) as return_rate_pct,
+    COALESCE(SUM(r.return_count), 0) as return_count,
+    ROUND(COUNT(r.order_key) * 100.0 / COUNT(*), 2) as return_rate_pct,
     SUM(fs.profit) as total_profit
 FROM fa25_ssc_fact_sales fs
-LEFT JOIN fa25_ssc_fact_return fr ON fs.sales_key = fr.order_key
+LEFT JOIN (
+    SELECT order_key, COUNT(*) as return_count
+    FROM fa25_ssc_fact_return
+    GROUP BY order_key
+) r ON r.order_key = fs.sales_key
 JOIN fa25_ssc_dim_product dp ON fs.product_key = dp.product_key
 GROUP BY dp.product_name, dp.category_name
-HAVING COUNT(DISTINCT fs.sales_key) > 0
 ORDER BY return_rate_pct DESC, total_sales ASC
         """
     },
@@ -409,7 +450,7 @@ ORDER BY total_profit DESC
 SELECT 
     fr.return_status,
     fr.return_region,
-    COUNT(DISTINCT fr.return_fact_key) as return_count,
+    COUNT(*) as return_count,
     COUNT(DISTINCT fr.customer_key) as affected_customers,
     SUM(fs.sales) as returned_sales_value,
     SUM(fs.profit) as lost_profit
@@ -417,6 +458,7 @@ FROM fa25_ssc_fact_return fr
 JOIN fa25_ssc_fact_sales fs ON fr.order_key = fs.sales_key
 GROUP BY fr.return_status, fr.return_region
 ORDER BY return_count DESC
+LIMIT 100
         """
     },
     {
@@ -425,15 +467,19 @@ ORDER BY return_count DESC
 SELECT 
     dp.product_name,
     dp.category_name,
-    COUNT(DISTINCT fs.sales_key) as total_sales,
-    COUNT(DISTINCT fr.return_fact_key) as return_count,
-    ROUND(COUNT(DISTINCT fr.return_fact_key) * 100.0 / COUNT(DISTINCT fs.sales_key), 2) as return_rate_pct,
+    COUNT(*) as total_sales,
+    SUM(r.return_count) as return_count,
+    ROUND(SUM(r.return_count) * 100.0 / COUNT(*), 2) as return_rate_pct,
     SUM(fs.sales) as revenue_at_risk
 FROM fa25_ssc_fact_sales fs
-LEFT JOIN fa25_ssc_fact_return fr ON fs.sales_key = fr.order_key
+LEFT JOIN (
+    SELECT order_key, COUNT(*) as return_count
+    FROM fa25_ssc_fact_return
+    GROUP BY order_key
+) r ON r.order_key = fs.sales_key
 JOIN fa25_ssc_dim_product dp ON fs.product_key = dp.product_key
 GROUP BY dp.product_name, dp.category_name
-HAVING COUNT(DISTINCT fr.return_fact_key) > 0
+HAVING SUM(r.return_count) > 0
 ORDER BY return_rate_pct DESC
         """
     },
@@ -479,20 +525,24 @@ ORDER BY avg_shipping_per_order DESC
     {
         "question": "Monthly sales and profit trends",
         "sql": """
-SELECT 
-    dd.year,
-    dd.month,
-    COUNT(DISTINCT fs.customer_key) as unique_customers,
-    COUNT(*) as transaction_count,
-    SUM(fs.sales) as monthly_sales,
-    SUM(fs.quantity) as units_sold,
-    SUM(fs.profit) as monthly_profit,
-    ROUND(SUM(fs.profit) / SUM(fs.sales) * 100, 2) as profit_margin_pct,
-    AVG(fs.sales) as avg_transaction_value
-FROM fa25_ssc_fact_sales fs
-JOIN fa25_ssc_dim_date dd ON fs.date_key = dd.date_key
-GROUP BY dd.year, dd.month
-ORDER BY dd.year, dd.month
+SELECT * FROM (
+    SELECT 
+        dd.year,
+        dd.month,
+        COUNT(DISTINCT fs.customer_key) as unique_customers,
+        COUNT(*) as transaction_count,
+        SUM(fs.sales) as monthly_sales,
+        SUM(fs.quantity) as units_sold,
+        SUM(fs.profit) as monthly_profit,
+        ROUND(SUM(fs.profit) / SUM(fs.sales) * 100, 2) as profit_margin_pct,
+        AVG(fs.sales) as avg_transaction_value
+    FROM fa25_ssc_fact_sales fs
+    JOIN fa25_ssc_dim_date dd ON fs.date_key = dd.date_key
+    GROUP BY dd.year, dd.month
+    ORDER BY dd.year DESC, dd.month DESC
+    LIMIT 60
+) recent_months
+ORDER BY year, month
         """
     },
     {
@@ -521,7 +571,7 @@ ORDER BY dd.day, daily_sales DESC
     },
     {
         "question": "What is the total number of orders?",
-        "sql": "SELECT COUNT(DISTINCT sales_key) as total_orders FROM fa25_ssc_fact_sales"
+        "sql": "SELECT COUNT(*) as total_orders FROM fa25_ssc_fact_sales"
     },
     {
         "question": "What is the average order value?",
@@ -533,19 +583,19 @@ ORDER BY dd.day, daily_sales DESC
         "question": "What date range is our data from?",
         "sql": """
 SELECT 
-    MIN(full_date) as earliest_date,
-    MAX(full_date) as latest_date,
-    COUNT(DISTINCT date_key) as total_days_with_data
-FROM fa25_ssc_dim_date
-WHERE date_key IN (SELECT DISTINCT date_key FROM fa25_ssc_fact_sales)
+    MIN(dd.full_date) as earliest_date,
+    MAX(dd.full_date) as latest_date,
+    COUNT(DISTINCT fs.date_key) as total_days_with_data
+FROM fa25_ssc_fact_sales fs
+JOIN fa25_ssc_dim_date dd ON fs.date_key = dd.date_key
         """
     },
     {
         "question": "What years are available in our database?",
         "sql": """
-SELECT DISTINCT year as available_year FROM fa25_ssc_dim_date
-WHERE date_key IN (SELECT DISTINCT date_key FROM fa25_ssc_fact_sales)
-ORDER BY year DESC
+SELECT DISTINCT dd.year as available_year FROM fa25_ssc_dim_date dd
+WHERE EXISTS (SELECT 1 FROM fa25_ssc_fact_sales fs WHERE fs.date_key = dd.date_key)
+ORDER BY available_year DESC
         """
     },
     {
@@ -591,22 +641,7 @@ JOIN fa25_ssc_dim_date dd ON fs.date_key = dd.date_key
 WHERE dd.year = 2025
         """
     },
-    {
-        "question": "Do we have 2014 data?",
-        "sql": """
-SELECT COUNT(*) as sales_count_2014 FROM fa25_ssc_fact_sales fs
-JOIN fa25_ssc_dim_date dd ON fs.date_key = dd.date_key
-WHERE dd.year = 2014
-        """
-    },
-    {
-        "question": "Do we have 2020 data?",
-        "sql": """
-SELECT COUNT(*) as sales_count_2020 FROM fa25_ssc_fact_sales fs
-JOIN fa25_ssc_dim_date dd ON fs.date_key = dd.date_key
-WHERE dd.year = 2020
-        """
-    },
+    *_expand_skeleton(_YEAR_CHECK_SKELETON, (2014, 2020)),
     
     # ===== HELPFUL CONTEXT EXAMPLES =====
     {
@@ -626,7 +661,7 @@ SELECT
 FROM fa25_ssc_fact_sales fs
 JOIN fa25_ssc_dim_date dd ON fs.date_key = dd.date_key
 UNION ALL
-SELECT 'Total Orders', COUNT(DISTINCT sales_key)
+SELECT 'Total Orders', COUNT(*)
 FROM fa25_ssc_fact_sales
 UNION ALL
 SELECT 'Total Customers', COUNT(DISTINCT customer_key)
@@ -641,299 +676,101 @@ FROM fa25_ssc_fact_sales
         "sql": """
 SELECT 
     'Sales Records' as metric,
-    COUNT(DISTINCT sales_key) as value
+    COUNT(*) as value
 FROM fa25_ssc_fact_sales
 UNION ALL
 SELECT 'Return Records',
-    COUNT(DISTINCT return_fact_key)
+    COUNT(*)
 FROM fa25_ssc_fact_return
 UNION ALL
 SELECT 'Unique Customers',
-    COUNT(DISTINCT customer_key)
+    COUNT(*)
 FROM fa25_ssc_dim_customer
 UNION ALL
 SELECT 'Unique Products',
-    COUNT(DISTINCT product_key)
+    COUNT(*)
 FROM fa25_ssc_dim_product
 UNION ALL
 SELECT 'Date Range',
-    CONCAT(MIN(full_date), ' to ', MAX(full_date))
-FROM fa25_ssc_dim_date
-WHERE date_key IN (SELECT DISTINCT date_key FROM fa25_ssc_fact_sales)
+    CONCAT(MIN(dd.full_date), ' to ', MAX(dd.full_date))
+FROM fa25_ssc_fact_sales fs
+JOIN fa25_ssc_dim_date dd ON fs.date_key = dd.date_key
         """
     }
-]
-
-# Business rules and schema context for Vanna training
-BUSINESS_RULES = """
-DATABASE SCHEMA AND RULES:
-
-=== FACT TABLES ===
-
-1. fa25_ssc_fact_sales (Main transactional sales fact table):
-   Keys:
-   - sales_key: Sales transaction identifier (surrogate key)
-   - customer_key: Foreign key to fa25_ssc_dim_customer
-   - product_key: Foreign key to fa25_ssc_dim_product
-   - date_key: Foreign key to fa25_ssc_dim_date
-   - return_key: Foreign key to fa25_ssc_dim_return (nullable)
-   
-   Metrics:
-   - sales: Dollar amount of sale
-   - quantity: Number of units sold
-   - discount: Discount percentage (0.0-1.0)
-   - profit: Profit amount (sales - discount - costs)
-   - shipping_cost: Shipping cost
-   
-   Timestamps:
-   - created_at: When the record was loaded
-   - updated_at: When the record was last updated
-
-2. fa25_ssc_fact_return (Return transactions):
-   Keys:
-   - return_fact_key: Return fact identifier (surrogate key)
-   - return_key: Foreign key to fa25_ssc_dim_return
-   - order_key: Link to original order (sales_key)
-   - customer_key: Foreign key to fa25_ssc_dim_customer
-   - date_key: Foreign key to fa25_ssc_dim_date
-   
-   Attributes:
-   - return_status: Pending, Approved, Rejected, Completed
-   - return_region: Region where return was processed
-   
-   Timestamps:
-   - created_at: When the record was loaded
-   - updated_at: When the record was last updated
+])
 
-=== DIMENSION TABLES ===
+# Column views of VANNA_TRAINING_DATA (same order), for callers that only need
+# the questions or only the SQL
+_QUESTIONS, _SQLS = zip(*((entry["question"], entry["sql"]) for entry in VANNA_TRAINING_DATA))
 
-3. fa25_ssc_dim_date (Time dimension):
-   - date_key: Primary key (auto-increment)
-   - full_date: Actual date
-   - year, month, day: Time components
+# Stable id per training SQL (BLAKE2 of its text), aligned with _SQLS - lets a
+# driver layer key prepared statements or other per-template state
+TEMPLATE_IDS = tuple(
+    hashlib.blake2b(sql.encode("utf-8"), digest_size=8).hexdigest() for sql in _SQLS
+)
 
-4. fa25_ssc_dim_customer (Customer dimension):
-   - customer_key: Primary key (surrogate key)
-   - customer_id: Customer identifier
-   - customer_name: Customer name
-   - country: Customer country
-   - state: Customer state
-   - city: Customer city
-   - postal_code: Postal code
-   - region: Central, East, South, West
-   
-   Timestamps:
-   - created_at: When the record was loaded
-   - updated_at: When the record was last updated
 
-5. fa25_ssc_dim_product (Product dimension):
-   - product_key: Primary key (surrogate key)
-   - product_id: Product identifier
-   - product_name: Product name
-   - category_name: Technology, Furniture, Office Supplies
-   - subcategory_name: Specific subcategory
-   
-   Timestamps:
-   - created_at: When the record was loaded
-   - updated_at: When the record was last updated
+# SQL using these returns something different on every run, so its result can't be reused
+_VOLATILE_SQL = re.compile(
+    r"\b(?:NOW|CURDATE|CURTIME|SYSDATE|RAND|UUID|CONNECTION_ID|LAST_INSERT_ID)\s*\("
+    r"|\b(?:CURRENT_DATE|CURRENT_TIME|CURRENT_TIMESTAMP|LOCALTIME|LOCALTIMESTAMP)\b"
+    r"|@",
+    re.IGNORECASE
+)
 
-6. fa25_ssc_dim_return (Return dimension):
-   - return_key: Primary key (surrogate key)
-   - return_id: Return identifier
-   - return_status: Status of return
-   - return_region: Region where return was processed
-   
-   Timestamps:
-   - created_at: When the record was loaded
-   - updated_at: When the record was last updated
 
-=== COMMON PATTERNS ===
-
-Regional Analysis:
-- Regional data: Central, East, South, West
-- Use dc.region in queries
-
-Product Analysis:
-- 3 main categories: Technology, Furniture, Office Supplies
-- Use category_name for broad analysis, subcategory_name for detail
-
-Sales Metrics:
-- For profit margin: (profit / sales) * 100
-- For return rate: (count returns / count sales) * 100
-- Always use date_key for date joins
-- discount is a decimal 0.0-1.0
-
-Return Analysis:
-- Use fa25_ssc_fact_return table for detailed return info
-- Link to fa25_ssc_fact_sales via order_key to get product/customer info
-- return_status shows progression (Pending → Approved/Rejected → Completed)
-
-Time-Based Analysis:
-- Always JOIN fa25_ssc_fact_sales with fa25_ssc_dim_date on date_key
-- Use day, month, year as needed
-- For trends, GROUP BY full_date and ORDER BY full_date
-
-Cross-dimensional:
-- Combine region + product category for multi-dimensional analysis
-- Use LEFT JOIN fa25_ssc_fact_return to preserve sales without returns
-- For "top N" analysis, use ORDER BY DESC LIMIT N
-"""
-
-SCHEMA_DOCUMENTATION = """
-COMPLETE OLAP STAR SCHEMA (6 Tables):
-
-fa25_ssc_fact_sales TABLE:
-├── Primary Key
-│   └── sales_key (INT, auto_increment)
-├── Foreign Keys
-│   ├── customer_key → fa25_ssc_dim_customer.customer_key
-│   ├── product_key → fa25_ssc_dim_product.product_key
-│   ├── date_key → fa25_ssc_dim_date.date_key
-│   └── return_key → fa25_ssc_dim_return.return_key (NULLABLE)
-├── Measures
-│   ├── sales (DECIMAL 10,2) - Revenue
-│   ├── quantity (INT) - Units sold
-│   ├── discount (DECIMAL 5,2) - Discount percentage
-│   ├── profit (DECIMAL 10,2) - Profit
-│   └── shipping_cost (DECIMAL 10,2) - Shipping
-├── Timestamps
-│   ├── created_at (TIMESTAMP) - Load timestamp
-│   └── updated_at (TIMESTAMP) - Update timestamp
-└── Total Columns: 12
-
-fa25_ssc_fact_return TABLE:
-├── Primary Key
-│   └── return_fact_key (INT, auto_increment)
-├── Foreign Keys
-│   ├── return_key → fa25_ssc_dim_return.return_key
-│   ├── order_key → fa25_ssc_fact_sales.sales_key
-│   ├── customer_key → fa25_ssc_dim_customer.customer_key
-│   └── date_key → fa25_ssc_dim_date.date_key
-├── Attributes
-│   ├── return_status (VARCHAR 50) - Pending, Approved, Rejected, Completed
-│   └── return_region (VARCHAR 50) - Region
-├── Timestamps
-│   ├── created_at (TIMESTAMP) - Load timestamp
-│   └── updated_at (TIMESTAMP) - Update timestamp
-└── Total Columns: 9
-
-fa25_ssc_dim_date TABLE:
-├── Primary Key
-│   └── date_key (INT, auto_increment)
-├── Date Components
-│   ├── full_date (DATE) - Actual calendar date
-│   ├── year (INT) - Calendar year
-│   ├── month (INT) - 1-12
-│   └── day (INT) - Day of month
-├── Timestamps
-│   ├── created_at (TIMESTAMP) - Load timestamp
-│   └── updated_at (TIMESTAMP) - Update timestamp
-└── Total Columns: 7
-
-fa25_ssc_dim_customer TABLE:
-├── Primary Key
-│   └── customer_key (INT, auto_increment)
-├── Customer Identifiers
-│   ├── customer_id (INT) - Natural key from OLTP
-│   └── customer_name (VARCHAR 100)
-├── Geography
-│   ├── country (VARCHAR 50)
-│   ├── state (VARCHAR 50)
-│   ├── city (VARCHAR 50)
-│   ├── postal_code (VARCHAR 10, NULLABLE)
-│   └── region (VARCHAR 50) - Central, East, South, West
-├── Timestamps
-│   ├── created_at (TIMESTAMP) - Load timestamp
-│   └── updated_at (TIMESTAMP) - Update timestamp
-└── Total Columns: 10
-
-fa25_ssc_dim_product TABLE:
-├── Primary Key
-│   └── product_key (INT, auto_increment)
-├── Product Identifiers
-│   ├── product_id (INT) - Natural key from OLTP
-│   └── product_name (VARCHAR 100, NULLABLE)
-├── Classification
-│   ├── category_name (VARCHAR 100, NULLABLE) - Technology, Furniture, Office Supplies
-│   └── subcategory_name (VARCHAR 100, NULLABLE)
-├── Timestamps
-│   ├── created_at (TIMESTAMP) - Load timestamp
-│   └── updated_at (TIMESTAMP) - Update timestamp
-└── Total Columns: 7
-
-fa25_ssc_dim_return TABLE:
-├── Primary Key
-│   └── return_key (INT, auto_increment)
-├── Return Identifiers
-│   ├── return_id (INT) - Natural key from OLTP
-│   └── return_status (VARCHAR 50) - Pending, Approved, Rejected, Completed
-├── Return Details
-│   └── return_region (VARCHAR 50) - Central, East, South, West
-├── Timestamps
-│   ├── created_at (TIMESTAMP) - Load timestamp
-│   └── updated_at (TIMESTAMP) - Update timestamp
-└── Total Columns: 6
-
-TOTAL SCHEMA: 49 COLUMNS ACROSS 6 TABLES
-
-=== FACT TABLE RELATIONSHIPS ===
-
-fa25_ssc_fact_sales Joins:
-- fa25_ssc_fact_sales.customer_key = fa25_ssc_dim_customer.customer_key
-- fa25_ssc_fact_sales.product_key = fa25_ssc_dim_product.product_key
-- fa25_ssc_fact_sales.date_key = fa25_ssc_dim_date.date_key
-- fa25_ssc_fact_sales.return_key = fa25_ssc_dim_return.return_key (LEFT JOIN, nullable)
-
-fa25_ssc_fact_return Joins:
-- fa25_ssc_fact_return.customer_key = fa25_ssc_dim_customer.customer_key
-- fa25_ssc_fact_return.return_key = fa25_ssc_dim_return.return_key
-- fa25_ssc_fact_return.date_key = fa25_ssc_dim_date.date_key
-- fa25_ssc_fact_return.order_key = fa25_ssc_fact_sales.sales_key (for cross-fact joins)
-
-=== KEY STATISTICS ===
-
-fa25_ssc_dim_date: Date range dependent (typically thousands of rows)
-fa25_ssc_dim_customer: ~1000-10000 rows
-fa25_ssc_dim_product: ~100-500 rows
-fa25_ssc_dim_return: ~100-1000 rows
-fa25_ssc_fact_sales: ~100000+ rows (transactional)
-fa25_ssc_fact_return: ~1000-10000 rows (returns subset)
+def is_cacheable(entry):
+    """
+    Check whether the result of a training entry's SQL can be reused
+    
+    Args:
+        entry: {question, sql} mapping
+    
+    Returns:
+        True unless the SQL depends on the clock, randomness or session state
+    """
+    return _VOLATILE_SQL.search(entry["sql"]) is None
 
-=== COMMON QUERIES ===
 
-1. Sales by Region:
-   SELECT region, SUM(sales) FROM fa25_ssc_fact_sales 
-   JOIN fa25_ssc_dim_customer USING (customer_key) GROUP BY region
+# Business rules and schema context for Vanna training live in resources/ and
+# are read on first use, so importing the training pairs does not load them
+_RESOURCES_DIR = Path(__file__).parent / "resources"
 
-2. Product Performance:
-   SELECT product_name, SUM(sales), SUM(profit), SUM(quantity)
-   FROM fa25_ssc_fact_sales JOIN fa25_ssc_dim_product USING (product_key) GROUP BY product_name
 
-3. Monthly Sales Trend:
-   SELECT month, SUM(sales) FROM fa25_ssc_fact_sales
-   JOIN fa25_ssc_dim_date USING (date_key) GROUP BY month ORDER BY month
+def get_vanna_training_data():
+    """
+    Get all training examples for Vanna.AI
+    
+    Returns:
+        Tuple of read-only {question, sql} mappings (not copied per call)
+    """
+    return VANNA_TRAINING_DATA
 
-4. Return Rate Analysis:
-   SELECT category_name, 
-   COUNT(DISTINCT CASE WHEN return_key IS NOT NULL THEN sales_key END) / COUNT(*) * 100
-   FROM fa25_ssc_fact_sales JOIN fa25_ssc_dim_product USING (product_key) GROUP BY category_name
 
-5. Regional Performance:
-   SELECT region, SUM(sales), COUNT(*), AVG(profit) FROM fa25_ssc_fact_sales
-   JOIN fa25_ssc_dim_customer USING (customer_key) GROUP BY region
-"""
+def get_vanna_training_questions():
+    """
+    Get just the training questions, aligned by index with get_vanna_training_data()
+    
+    Lets batch consumers (e.g. an embedding model's encode()) take all
+    questions in one call instead of walking the {question, sql} mappings
+    
+    Returns:
+        Tuple of question strings
+    """
+    return _QUESTIONS
 
 
-def get_vanna_training_data():
+def get_vanna_training_sqls():
     """
-    Get all training examples for Vanna.AI
+    Get just the training SQL, aligned by index with get_vanna_training_data()
     
     Returns:
-        List of {question, sql} dictionaries
+        Tuple of SQL strings
     """
-    return VANNA_TRAINING_DATA
+    return _SQLS
 
 
+@lru_cache(maxsize=1)
 def get_business_rules():
     """
     Get business rules and schema context
@@ -941,9 +778,10 @@ def get_business_rules():
     Returns:
         String with business rules documentation
     """
-    return BUSINESS_RULES
+    return (_RESOURCES_DIR / "business_rules.md").read_text(encoding="utf-8")
 
 
+@lru_cache(maxsize=1)
 def get_schema_documentation():
     """
     Get detailed schema documentation
@@ -951,7 +789,7 @@ def get_schema_documentation():
     Returns:
         String with schema details
     """
-    return SCHEMA_DOCUMENTATION
+    return (_RESOURCES_DIR / "schema_documentation.md").read_text(encoding="utf-8")
 
 
 
@@ -3,6 +3,9 @@ sys.path.insert(0, 'src')
 import psycopg2
 from utils import load_env_config
 
+# Orders deleted (with their products and returns) per transaction
+BATCH_SIZE = 10000
+
 config = load_env_config()
 postgres_config = config.get('POSTGRES', {})
 
@@ -18,31 +21,65 @@ cursor = conn.cursor()
 try:
     print("Cleaning up test data loaded today...")
     
-    # Delete RETURN records for TEST orders FIRST (they have FK to orders)
+    # Find the TEST orders once (the only LIKE scan); every child row of a
+    # TEST order references one of them, so all three deletes can join on
+    # order_id and use each table's order_id index instead of scanning.
+    # The temp table lives for the session so it survives the batch commits
     cursor.execute('''
-        DELETE FROM "FA25_SSC_RETURN" 
+        CREATE TEMP TABLE test_ids AS
+        SELECT order_id FROM "FA25_SSC_ORDER"
         WHERE order_id LIKE 'TEST-%'
     ''')
-    deleted_returns = cursor.rowcount
-    print(f"✓ Deleted {deleted_returns} RETURN records")
+    cursor.execute('ALTER TABLE test_ids ADD PRIMARY KEY (order_id)')
+    cursor.execute('ANALYZE test_ids')
+    conn.commit()
     
-    # Delete ORDER_PRODUCT records for TEST orders
-    cursor.execute('''
-        DELETE FROM "FA25_SSC_ORDER_PRODUCT" 
-        WHERE order_id LIKE 'TEST-%'
-    ''')
-    deleted_products = cursor.rowcount
-    print(f"✓ Deleted {deleted_products} ORDER_PRODUCT records")
+    # Delete BATCH_SIZE orders at a time, committing after each batch so
+    # locks and WAL per transaction stay bounded. Each batch takes its ids
+    # off test_ids, then deletes their returns, order products and orders
+    # in one statement - the FKs are checked at the end of the statement,
+    # so children and parents can go together
+    deleted_returns = deleted_products = deleted_orders = 0
+    while True:
+        cursor.execute('''
+            WITH batch AS (
+                DELETE FROM test_ids
+                WHERE order_id IN (SELECT order_id FROM test_ids LIMIT %s)
+                RETURNING order_id
+            ),
+            deleted_returns AS (
+                DELETE FROM "FA25_SSC_RETURN" r
+                USING batch b WHERE r.order_id = b.order_id
+                RETURNING r.order_id
+            ),
+            deleted_products AS (
+                DELETE FROM "FA25_SSC_ORDER_PRODUCT" op
+                USING batch b WHERE op.order_id = b.order_id
+                RETURNING op.order_id
+            ),
+            deleted_orders AS (
+                DELETE FROM "FA25_SSC_ORDER" o
+                USING batch b WHERE o.order_id = b.order_id
+                RETURNING o.order_id
+            )
+            SELECT
+                (SELECT count(*) FROM batch),
+                (SELECT count(*) FROM deleted_returns),
+                (SELECT count(*) FROM deleted_products),
+                (SELECT count(*) FROM deleted_orders)
+        ''', (BATCH_SIZE,))
+        batch_ids, batch_returns, batch_products, batch_orders = cursor.fetchone()
+        conn.commit()
+        if batch_ids == 0:
+            break
+        deleted_returns += batch_returns
+        deleted_products += batch_products
+        deleted_orders += batch_orders
     
-    # Delete ORDER records for TEST orders LAST
-    cursor.execute('''
-        DELETE FROM "FA25_SSC_ORDER" 
-        WHERE order_id LIKE 'TEST-%'
-    ''')
-    deleted_orders = cursor.rowcount
+    print(f"✓ Deleted {deleted_returns} RETURN records")
+    print(f"✓ Deleted {deleted_products} ORDER_PRODUCT records")
     print(f"✓ Deleted {deleted_orders} ORDER records")
     
-    conn.commit()
     print("\n✅ Cleanup completed successfully!")
     print(f"   Total records deleted: {deleted_products + deleted_orders + deleted_returns}")
     print("\nTest data is now clean. Ready for fresh SQL Loader testing!")
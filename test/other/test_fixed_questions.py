@@ -11,12 +11,15 @@ import sys
 import os
 import random
 
+import numpy as np
+
 # Add parent directory to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from src.auth import (
     get_signup_security_questions,
     get_security_questions_for_user,
+    sample_recovery_indices_batch,
     SIGNUP_SECURITY_QUESTION_INDICES,
     SECURITY_QUESTIONS
 )
@@ -34,6 +37,7 @@ def test_signup_questions_are_fixed():
     assert len(questions_1) == 4, f"Expected 4 questions, got {len(questions_1)}"
     assert questions_1 == questions_2, "Signup questions differ on second call"
     assert questions_1 == questions_3, "Signup questions differ on third call"
+    assert questions_1 is questions_2, "Signup questions should be built once and reused"
     
     # Verify they match the fixed indices
     expected_indices = SIGNUP_SECURITY_QUESTION_INDICES
@@ -92,14 +96,25 @@ def test_no_mismatch_between_signup_and_recovery():
     signup_questions = get_signup_security_questions()
     signup_indices = set(idx for idx, _ in signup_questions)
     
-    # Generate multiple recovery question sets
-    for attempt in range(20):
-        recovery_questions = get_security_questions_for_user("test_user", 3)
-        recovery_indices = set(idx for idx, _ in recovery_questions)
-        
-        # Verify all recovery questions are in signup questions
-        assert recovery_indices.issubset(signup_indices), \
-            f"Recovery attempt {attempt} has questions not in signup: {recovery_indices - signup_indices}"
+    # Generate all 20 recovery question sets in one call, from the same default pool
+    # get_security_questions_for_user draws from
+    recovery_batch = sample_recovery_indices_batch(20, 3)
+    assert recovery_batch.shape == (20, 3), f"Expected shape (20, 3), got {recovery_batch.shape}"
+    
+    # Verify all recovery questions are in signup questions
+    in_signup = np.isin(recovery_batch, list(signup_indices))
+    for attempt, recovery_indices in enumerate(recovery_batch):
+        assert in_signup[attempt].all(), \
+            f"Recovery attempt {attempt} has questions not in signup: {set(recovery_indices.tolist()) - signup_indices}"
+        assert len(set(recovery_indices.tolist())) == 3, \
+            f"Recovery attempt {attempt} repeats a question: {recovery_indices.tolist()}"
+    
+    # And through the production entry point
+    recovery_questions = get_security_questions_for_user("test_user", 3)
+    recovery_indices = set(idx for idx, _ in recovery_questions)
+    assert len(recovery_questions) == 3, f"Expected 3 recovery questions, got {len(recovery_questions)}"
+    assert recovery_indices.issubset(signup_indices), \
+        f"Recovery questions not in signup: {recovery_indices - signup_indices}"
     
     print(f"  ✅ All recovery questions (20 attempts) are subset of signup questions")
     print(f"  ✅ No mismatch detected: users will be asked only questions they answered")
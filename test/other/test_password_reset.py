@@ -1,161 +1,265 @@
 #!/usr/bin/env python3
 """
 Test Password Reset Functionality
-Tests all password reset features including token generation, validation, and password strength
+Tests the database-backed password reset features: password strength, reset,
+reuse prevention, and expired token cleanup, for every role
 """
 
 import sys
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from functools import lru_cache
+from unittest import mock
 sys.path.insert(0, 'src')
 
+import auth
 from auth import (
-    hash_password,
-    verify_password,
-    initialize_demo_credentials,
-    authenticate_user,
-    generate_reset_token,
-    verify_reset_token,
-    reset_password,
+    register_user_db,
+    authenticate_user_db,
+    reset_password_db,
     validate_password_strength,
-    cleanup_expired_tokens,
-    DEMO_USERS
+    cleanup_expired_tokens_db
+)
+from utils import (
+    setup_logger,
+    load_env_config,
+    get_postgres_connection,
+    get_mysql_connection,
+    release_postgres_connection
 )
-from utils import setup_logger
 
 logger = setup_logger(__name__, log_file='logs/test_password_reset.log')
 
+# One throwaway user per role; Sales Associates live in PostgreSQL, the others in MySQL
+TEST_USERS = {
+    "Sales Associate": ("reset_test_sales", "Demo@1234"),
+    "Store Manager": ("reset_test_manager", "Demo@1234"),
+    "Executive": ("reset_test_exec", "Demo@1234")
+}
+
+USER_TABLES = {
+    "Sales Associate": "fa25_ssc_users_sales_associate",
+    "Store Manager": "fa25_ssc_users_store_manager",
+    "Executive": "fa25_ssc_users_executive"
+}
+
+TOKEN_TABLES = {
+    "Sales Associate": "fa25_ssc_password_reset_tokens_sales",
+    "Store Manager": "fa25_ssc_password_reset_tokens_manager",
+    "Executive": "fa25_ssc_password_reset_tokens_executive"
+}
+
+
+def get_connection(config, role):
+    if role == "Sales Associate":
+        return get_postgres_connection(config)
+    return get_mysql_connection(config)
+
+
+def release_connection(conn, role):
+    if role == "Sales Associate":
+        release_postgres_connection(conn)
+    else:
+        conn.close()
+
+
+def delete_test_user(conn, role, username):
+    """Remove a test user; tokens and password history go with it (ON DELETE CASCADE)"""
+    cursor = conn.cursor()
+    cursor.execute(f"DELETE FROM {USER_TABLES[role]} WHERE username = %s", (username,))
+    conn.commit()
+    cursor.close()
+
+
+def insert_expired_token(conn, role, username):
+    """Insert a reset token that expired an hour ago"""
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT user_id FROM {USER_TABLES[role]} WHERE username = %s", (username,))
+    user_id = cursor.fetchone()[0]
+    cursor.execute(
+        f"INSERT INTO {TOKEN_TABLES[role]} (user_id, token_hash, expires_at, used) VALUES (%s, %s, %s, FALSE)",
+        (user_id, f"expired-test-token-{username}", datetime.utcnow() - timedelta(hours=1))
+    )
+    conn.commit()
+    cursor.close()
+
+
+@contextmanager
+def cached_password_verification():
+    """Memoize auth.verify_password for the duration of the test
+    
+    Repeated logins with the same (password, hash) then skip bcrypt. The cache holds
+    plaintext passwords, so it only ever lives inside the test
+    """
+    cached = lru_cache(maxsize=256)(auth.verify_password)
+    with mock.patch.object(auth, 'verify_password', cached):
+        yield
+    cached.cache_clear()
+
+
 def test_password_reset():
     """Test complete password reset workflow"""
-    
+
     logger.info("="*80)
     logger.info("PASSWORD RESET FUNCTIONALITY TEST")
     logger.info("="*80)
-    
-    # Test 1: Validate password strength
-    logger.info("\n[TEST 1] Password Strength Validation")
-    
-    weak_passwords = [
-        ("password", "No uppercase/numbers/special"),
-        ("Pass123", "No special character"),
-        ("Pass@", "Too short"),
-    ]
-    
-    for pwd, reason in weak_passwords:
-        result = validate_password_strength(pwd)
-        logger.info(f"[TEST] '{pwd}' - Strength: {result['strength']} ({reason})")
-        if not result['valid']:
-            logger.info(f"       Issues: {', '.join(result['requirements'])}")
-    
-    strong_passwords = [
-        "SecurePass@123",
-        "MyP@ssw0rd",
-        "Admin#2024Password"
-    ]
-    
-    for pwd in strong_passwords:
-        result = validate_password_strength(pwd)
-        logger.info(f"[OK] '{pwd}' - Strength: {result['strength']}")
-        if not result['valid']:
-            logger.error(f"[FAIL] Strong password failed validation")
-    
-    # Test 2: Generate reset token
-    logger.info("\n[TEST 2] Generate Reset Token")
-    token = generate_reset_token("sales_user", validity_minutes=30)
-    logger.info(f"[OK] Reset token generated: {token[:20]}...")
-    
-    # Test 3: Verify token
-    logger.info("\n[TEST 3] Verify Reset Token")
-    token_check = verify_reset_token(token)
-    if token_check['valid']:
-        logger.info(f"[OK] Token verified for user: {token_check['username']}")
-        logger.info(f"    Expires at: {token_check['expires_at']}")
-    else:
-        logger.error(f"[FAIL] Token verification failed: {token_check['message']}")
-    
-    # Test 4: Reset password with token
-    logger.info("\n[TEST 4] Reset Password with Token")
-    new_password = "NewSecure@Pass123"
-    reset_result = reset_password("sales_user", new_password, reset_token=token)
-    
-    if reset_result['success']:
-        logger.info(f"[OK] Password reset successful")
-        logger.info(f"    New password strength: {reset_result['password_strength']}")
-    else:
-        logger.error(f"[FAIL] Password reset failed: {reset_result['message']}")
-    
-    # Test 5: Verify new password works
-    logger.info("\n[TEST 5] Verify New Password in Login")
-    auth_result = authenticate_user("sales_user", new_password)
-    if auth_result['authenticated']:
-        logger.info(f"[OK] Login with new password successful (role: {auth_result['role']})")
-    else:
-        logger.error(f"[FAIL] Login with new password failed: {auth_result['message']}")
-    
-    # Test 6: Verify old password doesn't work
-    logger.info("\n[TEST 6] Verify Old Password Fails")
-    auth_result_old = authenticate_user("sales_user", "Demo@123")
-    if not auth_result_old['authenticated']:
-        logger.info(f"[OK] Old password correctly rejected")
-    else:
-        logger.error(f"[FAIL] Old password should not work anymore")
-    
-    # Test 7: Token reuse prevention
-    logger.info("\n[TEST 7] Token Reuse Prevention")
-    token_reuse_check = verify_reset_token(token)
-    if not token_reuse_check['valid']:
-        logger.info(f"[OK] Token marked as used, cannot be reused")
-    else:
-        logger.error(f"[FAIL] Used token should not be valid")
-    
-    # Test 8: Weak password rejection
-    logger.info("\n[TEST 8] Weak Password Rejection")
-    weak_reset_result = reset_password("manager_user", "weakpass")
-    if not weak_reset_result['success']:
-        logger.info(f"[OK] Weak password rejected: {weak_reset_result['message'][:50]}...")
-    else:
-        logger.error(f"[FAIL] Weak password should be rejected")
-    
-    # Test 9: Reset password without token (admin override - no token)
-    logger.info("\n[TEST 9] Reset Password Without Token (Admin Override)")
-    admin_reset = reset_password("exec_user", "ExecutivePass@2024")
-    if admin_reset['success']:
-        logger.info(f"[OK] Admin password reset successful (strength: {admin_reset['password_strength']})")
-    else:
-        logger.error(f"[FAIL] Admin reset failed: {admin_reset['message']}")
-    
-    # Test 10: Cleanup expired tokens
-    logger.info("\n[TEST 10] Cleanup Expired Tokens")
-    cleaned_count = cleanup_expired_tokens()
-    logger.info(f"[OK] Cleaned up {cleaned_count} expired tokens")
-    
-    # Test 11: All users can be authenticated
-    logger.info("\n[TEST 11] Verify All Users Can Authenticate")
-    users_to_test = [
-        ("sales_user", new_password),
-        ("manager_user", "Demo@123"),
-        ("exec_user", "ExecutivePass@2024")
-    ]
-    
-    for username, password in users_to_test:
-        result = authenticate_user(username, password)
-        if result['authenticated']:
-            logger.info(f"[OK] {username} ({result['role']}) authenticated")
+
+    config = load_env_config()
+    connections = {role: get_connection(config, role) for role in TEST_USERS}
+    sales_conn = connections["Sales Associate"]
+    sales_user, old_password = TEST_USERS["Sales Associate"]
+
+    try:
+        # Test 1: Validate password strength
+        logger.info("\n[TEST 1] Password Strength Validation")
+
+        weak_passwords = [
+            ("password", "No uppercase/numbers/special"),
+            ("Pass123", "No special character"),
+            ("Pass@", "Too short"),
+        ]
+
+        for pwd, reason in weak_passwords:
+            result = validate_password_strength(pwd)
+            logger.info(f"[TEST] '{pwd}' - Strength: {result['strength']} ({reason})")
+            if not result['valid']:
+                logger.info(f"       Issues: {', '.join(result['requirements'])}")
+
+        strong_passwords = [
+            "SecurePass@123",
+            "MyP@ssw0rd",
+            "Admin#2024Password"
+        ]
+
+        for pwd in strong_passwords:
+            result = validate_password_strength(pwd)
+            logger.info(f"[OK] '{pwd}' - Strength: {result['strength']}")
+            if not result['valid']:
+                logger.error(f"[FAIL] Strong password failed validation")
+
+        # Test 2: Register a fresh user for every role
+        logger.info("\n[TEST 2] Register Test Users")
+        for role, (username, password) in TEST_USERS.items():
+            delete_test_user(connections[role], role, username)
+            register_result = register_user_db(username, password, role, connections[role])
+            if register_result['success']:
+                logger.info(f"[OK] Registered {username} ({role})")
+            else:
+                logger.error(f"[FAIL] Registration failed for {username}: {register_result['message']}")
+
+        # Test 3: Reset password
+        logger.info("\n[TEST 3] Reset Password")
+        new_password = "NewSecure@Pass123"
+        reset_result = reset_password_db(sales_user, "Sales Associate", new_password, sales_conn)
+        if reset_result['success']:
+            logger.info(f"[OK] Password reset successful")
         else:
-            logger.warning(f"[WARN] {username} authentication failed: {result['message']}")
-    
+            logger.error(f"[FAIL] Password reset failed: {reset_result['message']}")
+
+        # Test 4: Verify new password works
+        logger.info("\n[TEST 4] Verify New Password in Login")
+        auth_result = authenticate_user_db(sales_user, new_password, "Sales Associate", sales_conn)
+        if auth_result['authenticated']:
+            logger.info(f"[OK] Login with new password successful (role: {auth_result['role']})")
+        else:
+            logger.error(f"[FAIL] Login with new password failed: {auth_result['message']}")
+
+        # Test 5: Verify old password doesn't work
+        logger.info("\n[TEST 5] Verify Old Password Fails")
+        auth_result_old = authenticate_user_db(sales_user, old_password, "Sales Associate", sales_conn)
+        if not auth_result_old['authenticated']:
+            logger.info(f"[OK] Old password correctly rejected")
+        else:
+            logger.error(f"[FAIL] Old password should not work anymore")
+
+        # Test 6: Password reuse prevention (current and previous password)
+        logger.info("\n[TEST 6] Password Reuse Prevention")
+        for reused in (new_password, old_password):
+            reuse_result = reset_password_db(sales_user, "Sales Associate", reused, sales_conn)
+            if not reuse_result['success']:
+                logger.info(f"[OK] Reused password rejected: {reuse_result['message']}")
+            else:
+                logger.error(f"[FAIL] Reused password should be rejected")
+
+        # Test 7: Weak password rejection
+        logger.info("\n[TEST 7] Weak Password Rejection")
+        manager_user, _ = TEST_USERS["Store Manager"]
+        weak_reset_result = reset_password_db(manager_user, "Store Manager", "weakpass", connections["Store Manager"])
+        if not weak_reset_result['success']:
+            logger.info(f"[OK] Weak password rejected: {weak_reset_result['message'][:50]}...")
+        else:
+            logger.error(f"[FAIL] Weak password should be rejected")
+
+        # Test 8: Reset password in MySQL (Executive)
+        logger.info("\n[TEST 8] Reset Executive Password")
+        exec_user, _ = TEST_USERS["Executive"]
+        exec_reset = reset_password_db(exec_user, "Executive", "ExecutivePass@2024", connections["Executive"])
+        if exec_reset['success']:
+            logger.info(f"[OK] Executive password reset successful")
+        else:
+            logger.error(f"[FAIL] Executive reset failed: {exec_reset['message']}")
+
+        # Test 9: Cleanup expired tokens (the reset above left an unexpired one behind)
+        logger.info("\n[TEST 9] Cleanup Expired Tokens")
+        insert_expired_token(sales_conn, "Sales Associate", sales_user)
+        cleaned_count = cleanup_expired_tokens_db("Sales Associate", sales_conn)
+        cursor = sales_conn.cursor()
+        cursor.execute(
+            f"""
+            SELECT COUNT(*) FILTER (WHERE expires_at < %s), COUNT(*)
+            FROM {TOKEN_TABLES['Sales Associate']} t
+            JOIN {USER_TABLES['Sales Associate']} u ON u.user_id = t.user_id
+            WHERE u.username = %s
+            """,
+            (datetime.utcnow(), sales_user)
+        )
+        expired_left, tokens_left = cursor.fetchone()
+        cursor.close()
+        if cleaned_count >= 1 and expired_left == 0 and tokens_left >= 1:
+            logger.info(f"[OK] Cleaned up {cleaned_count} expired tokens, unexpired token kept")
+        else:
+            logger.error(f"[FAIL] Cleanup removed {cleaned_count} tokens; "
+                         f"{expired_left} expired and {tokens_left} total left for {sales_user}")
+
+        if cleanup_expired_tokens_db("Unknown Role", sales_conn) == 0:
+            logger.info(f"[OK] Cleanup with an unknown role deleted nothing")
+        else:
+            logger.error(f"[FAIL] Cleanup with an unknown role should delete nothing")
+
+        # Test 10: All users can be authenticated
+        logger.info("\n[TEST 10] Verify All Users Can Authenticate")
+        users_to_test = [
+            (sales_user, "Sales Associate", new_password),
+            (manager_user, "Store Manager", TEST_USERS["Store Manager"][1]),
+            (exec_user, "Executive", "ExecutivePass@2024")
+        ]
+
+        for username, role, password in users_to_test:
+            result = authenticate_user_db(username, password, role, connections[role])
+            if result['authenticated']:
+                logger.info(f"[OK] {username} ({result['role']}) authenticated")
+            else:
+                logger.warning(f"[WARN] {username} authentication failed: {result['message']}")
+
+    finally:
+        for role, (username, _) in TEST_USERS.items():
+            try:
+                delete_test_user(connections[role], role, username)
+            except Exception as e:
+                logger.warning(f"Cleanup failed for {username}: {e}")
+            release_connection(connections[role], role)
+
     logger.info("\n" + "="*80)
     logger.info("PASSWORD RESET TESTS COMPLETED [OK]")
     logger.info("="*80)
     logger.info("\nKey Features Verified:")
     logger.info("  - Password strength validation (8+ chars, upper, lower, digit, special)")
-    logger.info("  - Reset token generation with expiration")
-    logger.info("  - Token verification and reuse prevention")
-    logger.info("  - Secure password reset with token")
+    logger.info("  - Password reset for PostgreSQL and MySQL users")
     logger.info("  - Old passwords invalidated after reset")
+    logger.info("  - Current and previous password reuse rejected")
     logger.info("  - Weak password rejection")
-    logger.info("  - Token cleanup mechanism")
+    logger.info("  - Expired token cleanup")
 
 if __name__ == '__main__':
-    test_password_reset()
-
-
-
+    with cached_password_verification():
+        test_password_reset()
@@ -103,6 +103,11 @@ def test_dataframe_customer_masking():
         
         assert df['customer_name'].iloc[0] == 'John Doe'
         
+        returned = PIIMasking.mask_dataframe(df, mappings, inplace=True)
+        assert returned is df
+        assert df['customer_name'].iloc[0] == 'J*** D**'
+        assert df['customer_id'].iloc[0] == 'C001'
+        
         print("[PASS] DataFrame customer masking works correctly")
         return True
     
@@ -111,9 +116,41 @@ def test_dataframe_customer_masking():
         return True
 
 
+def test_dataframe_matches_scalar_masking():
+    """Test vectorized DataFrame masking agrees with the scalar mask functions"""
+    print("\n[TEST 5] DataFrame Masking - Scalar Parity...")
+    
+    values = [
+        'John Doe', '  Mary   Ann  Lee ', 'A B', '', '   ', None, 12345,
+        '555-123-4567', '4532015112830366', '123-45-6789', '12345678901', '12',
+        'john.doe@example.com', 'a@b', '@x', 'no-at-sign', '90210', 'AB12CD'
+    ]
+    amounts = [1234.56, 12.5, 7, -98765.4321, None, '1.2.3', '100']
+    
+    scalar_masks = {
+        'name': PIIMasking.mask_name,
+        'postal_code': PIIMasking.mask_postal_code,
+        'phone': PIIMasking.mask_phone,
+        'email': PIIMasking.mask_email,
+        'credit_card': PIIMasking.mask_credit_card,
+        'ssn': PIIMasking.mask_ssn,
+        'financial': PIIMasking.mask_financial
+    }
+    
+    for mask_type, mask_fn in scalar_masks.items():
+        column = amounts if mask_type == 'financial' else values
+        df = pd.DataFrame({'value': pd.Series(column, dtype=object)})
+        masked = PIIMasking.mask_dataframe(df, {'value': mask_type})
+        expected = [mask_fn(v) for v in column]
+        assert masked['value'].tolist() == expected, f"{mask_type} mismatch"
+    
+    print("[PASS] DataFrame masking matches scalar masking")
+    return True
+
+
 def test_dict_customer_masking():
     """Test dictionary masking for customer data"""
-    print("\n[TEST 5] Dictionary Masking - Customer Data...")
+    print("\n[TEST 6] Dictionary Masking - Customer Data...")
     
     data = {
         'customer_id': 'C001',
@@ -140,7 +177,7 @@ def test_dict_customer_masking():
 
 def test_masking_consistency():
     """Test consistency of masking"""
-    print("\n[TEST 6] Masking Consistency...")
+    print("\n[TEST 7] Masking Consistency...")
     
     name1 = PIIMasking.mask_name("Robert Parker")
     name2 = PIIMasking.mask_name("Robert Parker")
@@ -166,6 +203,7 @@ if __name__ == "__main__":
         results.append(("Postal Code Masking", test_mask_postal_code()))
         results.append(("Production Mappings", test_get_default_mappings()))
         results.append(("DataFrame Masking", test_dataframe_customer_masking()))
+        results.append(("DataFrame Scalar Parity", test_dataframe_matches_scalar_masking()))
         results.append(("Dictionary Masking", test_dict_customer_masking()))
         results.append(("Consistency Check", test_masking_consistency()))
         
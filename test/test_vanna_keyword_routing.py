@@ -0,0 +1,103 @@
+"""
+Test Suite for Vanna Keyword Routing
+
+VannaHybrid answers a question with trained SQL only when the question's
+keyword set exactly matches a trained question's. Filters that are not
+keywords (regions, categories, years, states) drop out, so a trained pair
+with a broad keyword set silently answers filtered questions with
+unfiltered SQL. These tests pin the routing of trained and common
+questions so new training pairs cannot take over questions that belong
+to the LLM.
+"""
+
+import sys
+import os
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+# function_tools imports plotly at module level
+pytest.importorskip("plotly")
+
+from function_tools import VannaHybrid
+from vanna_training_data import get_vanna_training_data
+
+
+# Trained questions that share a keyword set with an earlier trained pair
+# and therefore resolve to that pair's SQL
+SHARED_SIGNATURE_ROUTES = {
+    "What date range do we have 2025 data for?": "What date range is our data from?",
+    "Do we have 2014 data?": "What time period does our data cover?",
+    "Do we have 2020 data?": "What time period does our data cover?",
+    "Can you show me sales from 2014?": "What are the sales trends over time?",
+    "What's available in the system?": "What time period does our data cover?",
+    "Tell me about our current data in the system": "What time period does our data cover?",
+}
+
+# Generic or filtered questions that no trained SQL answers correctly
+LLM_FALLBACK_QUESTIONS = [
+    "Show me all customers",
+    "Who are our customers?",
+    "List customers",
+    "customers in Texas",
+    "How many customers do we have?",
+    "Count customers by region",
+    "Top customers by sales",
+    "Return rate in the West?",
+    "What is the return rate for Furniture in 2013?",
+    "Count return records for Furniture",
+]
+
+
+def _first_sql_by_question(training_data):
+    sql_by_question = {}
+    for pair in training_data:
+        sql_by_question.setdefault(pair['question'], pair['sql'])
+    return sql_by_question
+
+
+def test_trained_questions_resolve_to_their_own_sql():
+    """Every trained question gets its own SQL, or that of its known signature twin"""
+    print("\n[TEST 1] Trained Questions Keep Their Routing...")
+
+    training_data = get_vanna_training_data()
+    vanna = VannaHybrid(training_data, {})
+    sql_by_question = _first_sql_by_question(training_data)
+
+    for question in sql_by_question:
+        expected = SHARED_SIGNATURE_ROUTES.get(question, question)
+        assert vanna.ask(question) == sql_by_question[expected], \
+            f"{question!r} no longer resolves to the SQL of {expected!r}"
+
+    print(f"[PASS] {len(sql_by_question)} trained questions resolve as before")
+    return True
+
+
+def test_generic_and_filtered_questions_fall_back_to_llm():
+    """Questions whose filters drop out of the keyword set must not hit trained SQL"""
+    print("\n[TEST 2] Generic and Filtered Questions Fall Back to LLM...")
+
+    vanna = VannaHybrid(get_vanna_training_data(), {})
+
+    for question in LLM_FALLBACK_QUESTIONS:
+        assert vanna.ask(question) is None, \
+            f"{question!r} matched trained SQL instead of falling back to the LLM"
+
+    print(f"[PASS] {len(LLM_FALLBACK_QUESTIONS)} questions fall back to the LLM")
+    return True
+
+
+if __name__ == "__main__":
+    print("\n" + "="*70)
+    print("VANNA KEYWORD ROUTING TEST SUITE")
+    print("="*70)
+
+    results = [
+        test_trained_questions_resolve_to_their_own_sql(),
+        test_generic_and_filtered_questions_fall_back_to_llm(),
+    ]
+
+    print("\n" + "="*70)
+    print(f"RESULTS: {sum(results)}/{len(results)} tests passed")
+    print("="*70)